@@ -0,0 +1,166 @@
+from collections import Counter
+from typing import Iterable
+
+import ahocorasick
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+BLOCKLIST_FIELDS = ("company", "title", "description")
+DEFAULT_FUZZY_THRESHOLD = 85
+
+
+class TitleBlocklist:
+    """Fuzzy title blocklist scored as one title × term matrix.
+
+    A title is blocked when fuzz.partial_ratio(title.lower(), term.lower())
+    reaches `threshold` for any term. Terms are lowercased and deduplicated
+    once; unseen titles are scored together with process.cdist on `workers`
+    threads (-1 = all cores), and every verdict is memoized by lowercased title,
+    so re-scraped or repeated titles cost a dict lookup.
+    """
+
+    def __init__(self, terms: Iterable[str], threshold: int = DEFAULT_FUZZY_THRESHOLD, workers: int = -1):
+        self.terms = list(dict.fromkeys(t.strip().lower() for t in terms if t and t.strip()))
+        self.threshold = threshold
+        self.workers = workers
+        self._verdicts: dict[str, int] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def first_match(self, titles: Iterable) -> np.ndarray:
+        """Index into self.terms of the first matching term per title, -1 if none."""
+        keys = [str(t).lower() for t in titles]
+        if not self.terms:
+            return np.full(len(keys), -1)
+        unseen = list(dict.fromkeys(k for k in keys if k not in self._verdicts))
+        if unseen:
+            scores = process.cdist(
+                unseen, self.terms,
+                scorer=fuzz.partial_ratio, score_cutoff=self.threshold,
+                dtype=np.float32, workers=self.workers,
+            )
+            hits = scores >= self.threshold
+            first = np.where(hits.any(axis=1), hits.argmax(axis=1), -1)
+            self._verdicts.update(zip(unseen, first.tolist()))
+        return np.fromiter((self._verdicts[k] for k in keys), dtype=int, count=len(keys))
+
+    def blocked(self, titles: Iterable) -> np.ndarray:
+        """Boolean mask, True where the title matches a term."""
+        return self.first_match(titles) >= 0
+
+
+class KeywordMatcher:
+    """Case-insensitive whole-word search for many keywords at once.
+
+    Keywords are compiled into one Aho-Corasick automaton, so each text is
+    scanned in a single linear pass however many keywords there are. A hit
+    only counts when it is not glued to letters or digits on either side
+    ("on-site only" matches "On-site only.", "intern" does not match
+    "internal"). Whitespace runs are collapsed in both keywords and text.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(
+            " ".join(k.lower().split()) for k in keywords if k and k.strip()
+        ))
+        self._automaton = ahocorasick.Automaton()
+        for i, keyword in enumerate(self.keywords):
+            self._automaton.add_word(keyword, (i, len(keyword)))
+        if self.keywords:
+            self._automaton.make_automaton()
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def _first(self, text) -> int:
+        if not isinstance(text, str) or not text:
+            return -1
+        text = " ".join(text.lower().split())
+        for end, (i, size) in self._automaton.iter(text):
+            start = end - size + 1
+            if (start == 0 or not text[start - 1].isalnum()) and (
+                end + 1 == len(text) or not text[end + 1].isalnum()
+            ):
+                return i
+        return -1
+
+    def first_match(self, texts: Iterable) -> np.ndarray:
+        """Index into self.keywords of the first keyword found per text, -1 if none."""
+        if not self.keywords:
+            return np.full(len(list(texts)), -1)
+        return np.fromiter((self._first(t) for t in texts), dtype=int)
+
+
+class BlocklistRules:
+    """A profile's blocklist rules over company, title and description.
+
+    Each rule is a dict {"field", "match_type", "pattern", "threshold"}:
+    "keyword" rules match whole words in any field (KeywordMatcher),
+    "fuzzy" rules match titles with partial_ratio >= threshold
+    (TitleBlocklist, default 85). Rules are grouped into one matcher per
+    field × match type (× threshold), run cheapest first — company, title,
+    then descriptions of the jobs still left — and a blocked job is credited
+    to the first rule that matched it.
+    """
+
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        self._matchers = []
+        groups: dict[tuple, list[int]] = {}
+        for i, rule in enumerate(rules):
+            if rule["match_type"] == "fuzzy":
+                threshold = rule.get("threshold") or DEFAULT_FUZZY_THRESHOLD
+                groups.setdefault((rule["field"], "fuzzy", threshold), []).append(i)
+            else:
+                groups.setdefault((rule["field"], "keyword", None), []).append(i)
+
+        order = {field: n for n, field in enumerate(BLOCKLIST_FIELDS)}
+        for field, match_type, threshold in sorted(groups, key=lambda g: (order[g[0]], g[1] == "fuzzy")):
+            members = groups[(field, match_type, threshold)]
+            patterns = [rules[i]["pattern"] for i in members]
+            if match_type == "fuzzy":
+                matcher = TitleBlocklist(patterns, threshold=threshold)
+                normalized = [p.strip().lower() for p in patterns]
+                terms = matcher.terms
+            else:
+                matcher = KeywordMatcher(patterns)
+                normalized = [" ".join(p.lower().split()) for p in patterns]
+                terms = matcher.keywords
+            # matcher index -> first rule with that (deduplicated) pattern
+            rule_ids = np.array([members[normalized.index(t)] for t in terms], dtype=int)
+            if matcher:
+                self._matchers.append((field, matcher, rule_ids))
+
+    def __bool__(self) -> bool:
+        return bool(self._matchers)
+
+    def label(self, i: int) -> str:
+        rule = self.rules[i]
+        return f"{rule['field']} {rule['match_type']} '{rule['pattern']}'"
+
+    def first_match(self, jobs: pd.DataFrame, fields: Iterable[str] | None = None) -> np.ndarray:
+        """Index into self.rules of the rule blocking each job, -1 if none.
+
+        Only `fields` (default: all) present in `jobs` are checked.
+        """
+        fields = set(fields or BLOCKLIST_FIELDS)
+        hit = np.full(len(jobs), -1)
+        for field, matcher, rule_ids in self._matchers:
+            if field not in fields or field not in jobs:
+                continue
+            todo = hit < 0
+            if not todo.any():
+                break
+            found = matcher.first_match(jobs[field].to_numpy()[todo])
+            hit[todo] = np.where(found >= 0, rule_ids[found], -1)
+        return hit
+
+    def filter(
+        self, jobs: pd.DataFrame, fields: Iterable[str] | None = None
+    ) -> tuple[pd.DataFrame, dict[str, int]]:
+        """Jobs no rule blocks, plus {rule label: jobs removed} for rules that fired."""
+        hit = self.first_match(jobs, fields)
+        removed = Counter(hit[hit >= 0].tolist())
+        return jobs[hit < 0], {self.label(i): n for i, n in removed.most_common()}
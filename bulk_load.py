@@ -0,0 +1,175 @@
+import csv
+import io
+import json
+import math
+from typing import Iterator
+
+import pandas as pd
+from sqlalchemy import Engine, text
+
+_INTEGER_TYPES = {"smallint", "integer", "bigint"}
+
+
+def table_columns(engine: Engine, schema: str, table: str) -> dict[str, str]:
+    """{column: data_type} of an existing table, in ordinal order; empty if missing."""
+    query = text("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = :schema AND table_name = :table
+        ORDER BY ordinal_position
+    """)
+    with engine.connect() as conn:
+        return {name: dtype for name, dtype in conn.execute(query, {"schema": schema, "table": table})}
+
+
+def _to_copy_value(value, is_integer: bool):
+    """Python/pandas value → CSV field. None means SQL NULL (written unquoted)."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if is_integer and value.is_integer():
+            return int(value)
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, str):
+        return value
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+class _CsvStream:
+    """Read-only file object that CSV-encodes rows lazily as COPY pulls them.
+
+    Uses csv.QUOTE_NOTNULL so None is written as an unquoted empty field
+    (NULL in COPY CSV) while empty strings stay "" — no row is materialized
+    ahead of what the driver asks for.
+    """
+
+    def __init__(self, rows: Iterator[tuple]):
+        self._rows = rows
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, quoting=csv.QUOTE_NOTNULL, lineterminator="\n")
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self._pending += self._buf.getvalue()
+            self._buf.seek(0)
+            self._buf.truncate()
+        if size < 0:
+            out, self._pending = self._pending, ""
+        else:
+            out, self._pending = self._pending[:size], self._pending[size:]
+        return out
+
+    readline = read
+
+
+def _rows(df: pd.DataFrame, columns: list[str], integer_cols: set[str]) -> Iterator[tuple]:
+    flags = [c in integer_cols for c in columns]
+    for row in df[columns].itertuples(index=False, name=None):
+        yield tuple(_to_copy_value(v, f) for v, f in zip(row, flags))
+
+
+def _copy(cur, df: pd.DataFrame, qualified_table: str, columns: list[str], target: dict[str, str]) -> int:
+    integer_cols = {c for c in columns if target[c] in _INTEGER_TYPES}
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    sql = f"COPY {qualified_table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    cur.copy_expert(sql, _CsvStream(_rows(df, columns, integer_cols)))
+    return cur.rowcount
+
+
+def _mapped_columns(
+    df: pd.DataFrame, target: dict[str, str], schema: str, table: str, warn: bool = True
+) -> list[str]:
+    if not target:
+        raise LookupError(f"{schema}.{table} does not exist")
+    skipped = [c for c in df.columns if c not in target]
+    if skipped and warn:
+        print(f"WARNING: {schema}.{table} has no column(s) {skipped} — not loaded")
+    return [c for c in df.columns if c in target]
+
+
+def copy_dataframe(engine: Engine, df: pd.DataFrame, schema: str, table: str) -> int:
+    """Append df to an existing table via COPY ... FROM STDIN (CSV).
+
+    Columns are matched by name; frame columns the table doesn't have are
+    skipped with a warning, and table columns missing from the frame get their
+    defaults. Returns the number of rows copied.
+    """
+    target = table_columns(engine, schema, table)
+    columns = _mapped_columns(df, target, schema, table)
+    if df.empty or not columns:
+        return 0
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            copied = _copy(cur, df, f'"{schema}"."{table}"', columns, target)
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return copied
+
+
+def upsert_dataframe(
+    engine: Engine, df: pd.DataFrame, schema: str, table: str, key: list[str]
+) -> int:
+    """COPY df into a temp table, then INSERT ... ON CONFLICT (key) DO UPDATE.
+
+    Duplicate keys within df collapse to their last row. On conflict, non-key
+    columns take the new value unless it is NULL, so a re-scrape without a
+    description never wipes a stored one. The target needs a unique index on
+    `key`. Frame columns the table lacks are skipped silently — the target is
+    usually a narrower, deduped model of the raw frame. Returns the number of
+    rows inserted or updated.
+    """
+    target = table_columns(engine, schema, table)
+    columns = _mapped_columns(df, target, schema, table, warn=False)
+    missing = [k for k in key if k not in columns]
+    if missing:
+        raise ValueError(f"upsert into {schema}.{table} needs key column(s) {missing}")
+    if df.empty:
+        return 0
+
+    df = df.drop_duplicates(subset=key, keep="last")
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    key_list = ", ".join(f'"{k}"' for k in key)
+    updates = ", ".join(
+        f'"{c}" = COALESCE(EXCLUDED."{c}", t."{c}")' for c in columns if c not in key
+    )
+    staging = f'"_upsert_{table}"'
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.execute(f'CREATE TEMP TABLE {staging} (LIKE "{schema}"."{table}") ON COMMIT DROP')
+            _copy(cur, df, staging, columns, target)
+            cur.execute(
+                f'INSERT INTO "{schema}"."{table}" AS t ({column_list}) '
+                f"SELECT {column_list} FROM {staging} "
+                f"ON CONFLICT ({key_list}) DO "
+                + (f"UPDATE SET {updates}" if updates else "NOTHING")
+            )
+            upserted = cur.rowcount
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return upserted
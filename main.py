@@ -1,22 +1,88 @@
 import json
+import logging
+import math
 import os
-from datetime import datetime, timedelta
-
-from rapidfuzz import fuzz
-
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import requests
 from jobspy import scrape_jobs
 from pandas import DataFrame
 from prefect import flow, runtime, task
+from prefect.futures import as_completed
+from prefect.task_runners import ThreadPoolTaskRunner
 from prefect_dbt import PrefectDbtRunner, PrefectDbtSettings
-from sqlalchemy import create_engine, text
+from sqlalchemy import Engine, create_engine, text
 
 from agent_eval import ClaudeJobEvaluator
+from blocklist import DEFAULT_FUZZY_THRESHOLD, BlocklistRules
+from bulk_load import copy_dataframe, upsert_dataframe
 from helper import format_job_message_telegram, format_summary_message_telegram
+from scrape_cache import load_cached_run, save_scrape
+from scrape_plan import (
+    allocate_budgets,
+    fan_out_rows,
+    plan_scrape_queries,
+    query_key,
+    single_profile_query,
+)
 
 USE_QUEUE = os.getenv("USE_QUEUE", "false").lower() == "true"
 
+# Shared SQLAlchemy pool per database (see _shared_engine)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# "copy" streams appends through COPY FROM STDIN (bulk_load); "multi" is the old to_sql path
+DB_WRITE_METHOD = os.getenv("DB_WRITE_METHOD", "copy")
+
+DBT_PROJECT_DIR = "data__job_searcher"
+# Nodes rebuilt by run_dbt: everything downstream of the freshly loaded raw table
+DBT_SELECT = os.getenv("DBT_SELECT", "source:jobspy.import_jobs+")
+
+SCRAPE_SITES = ["indeed", "linkedin", "google"]
+# Max title × location combos scraped at once by load_jobs_flow
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+# Per-site caps on top of the global limit, e.g. "indeed=3,linkedin=1,google=3"
+SCRAPE_SITE_CONCURRENCY = os.getenv("SCRAPE_SITE_CONCURRENCY", "indeed=3,linkedin=2,google=3")
+# Per-site timeout (s per attempt), retries and base backoff (s, doubled per retry).
+# Override individual sites with SCRAPE_SITE_POLICY='{"linkedin": {"retries": 5}}'
+SITE_SCRAPE_POLICY = {
+    "indeed": {"timeout": 180, "retries": 2, "backoff": 10},
+    "linkedin": {"timeout": 600, "retries": 3, "backoff": 60},
+    "google": {"timeout": 180, "retries": 2, "backoff": 10},
+}
+for _site, _override in json.loads(os.getenv("SCRAPE_SITE_POLICY", "{}")).items():
+    SITE_SCRAPE_POLICY[_site] = {**SITE_SCRAPE_POLICY.get(_site, {}), **_override}
+# hours_old used when a (site, title, location) has no watermark yet, and the upper bound otherwise
+SCRAPE_MAX_HOURS_OLD = int(os.getenv("SCRAPE_MAX_HOURS_OLD", "72"))
+# Extra hours re-requested on top of the gap since the last watermark
+SCRAPE_OVERLAP_HOURS = int(os.getenv("SCRAPE_OVERLAP_HOURS", "2"))
+# Lower bound on hours_old, so a night whose scrape was soft-blocked (jobspy
+# returns what it has without raising) is requested again the next night
+SCRAPE_MIN_HOURS_OLD = int(os.getenv("SCRAPE_MIN_HOURS_OLD", "48"))
+# Adaptive results_wanted: total across all (site, query) pairs (default: sum of
+# configured searches), per-pair bounds, and days of yield history considered
+SCRAPE_TOTAL_BUDGET = int(os.getenv("SCRAPE_TOTAL_BUDGET", "0")) or None
+SCRAPE_MIN_RESULTS = int(os.getenv("SCRAPE_MIN_RESULTS", "5"))
+SCRAPE_MAX_RESULTS = int(os.getenv("SCRAPE_MAX_RESULTS", "150"))
+SCRAPE_YIELD_DAYS = int(os.getenv("SCRAPE_YIELD_DAYS", "30"))
+# Days of jobspy.import_jobs partitions kept by prune_import_jobs_flow
+IMPORT_JOBS_RETENTION_DAYS = int(os.getenv("IMPORT_JOBS_RETENTION_DAYS", "14"))
+# Rows per server-side cursor fetch / description hydration / queue push in iter_jobs
+LOAD_JOBS_CHUNK_SIZE = int(os.getenv("LOAD_JOBS_CHUNK_SIZE", "200"))
+# Seconds a profile's compiled blocklist (and its title verdict memo) is reused
+BLOCKLIST_CACHE_SECONDS = int(os.getenv("BLOCKLIST_CACHE_SECONDS", "600"))
+
 
 # ---------------------------------------------------------------------------
 # Profile-specific fewshot eval prompt builder (v3_fewshot variant)
@@ -83,7 +149,34 @@ def build_eval_prompt(profile: str) -> str:
 # DB helpers
 # ---------------------------------------------------------------------------
 
-def get_db_engine():
+_ENGINES: dict[str, Engine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def _shared_engine(name: str, url: str) -> Engine:
+    """Process-wide pooled engine per database, built lazily on first use.
+
+    SQLAlchemy engines and their pools are thread-safe, so concurrent Prefect
+    tasks and scrape threads share one pool instead of a new TCP/auth
+    handshake per call.
+    """
+    engine = _ENGINES.get(name)
+    if engine is None:
+        with _ENGINES_LOCK:
+            engine = _ENGINES.get(name)
+            if engine is None:
+                engine = create_engine(
+                    url,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_recycle=DB_POOL_RECYCLE,
+                    pool_pre_ping=DB_POOL_PRE_PING,
+                )
+                _ENGINES[name] = engine
+    return engine
+
+
+def get_db_engine() -> Engine:
     db_host = os.getenv("DB_HOST")
     db_port = os.getenv("DB_PORT")
     db_name = os.getenv("DB_NAME")
@@ -92,15 +185,21 @@ def get_db_engine():
     connection_string = (
         f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
     )
-    return create_engine(connection_string)
+    return _shared_engine("db", connection_string)
 
 
-def get_queue_engine():
+def get_queue_engine() -> Engine:
     dsn = os.getenv("LLM_QUEUE_DSN")
-    return create_engine(dsn)
+    return _shared_engine("queue", dsn)
 
 
 def write_to_db(df: DataFrame, schema: str, table_name: str) -> None:
+    if DB_WRITE_METHOD == "copy":
+        try:
+            copy_dataframe(get_db_engine(), df, schema, table_name)
+            return
+        except LookupError:
+            pass  # table doesn't exist yet — let to_sql create it
     df.to_sql(
         name=table_name,
         con=get_db_engine(),
@@ -111,6 +210,51 @@ def write_to_db(df: DataFrame, schema: str, table_name: str) -> None:
     )
 
 
+JOBSPY_JOBS_INDEXES_SQL = """
+    SELECT i.indisunique, array_agg(a.attname::text ORDER BY k.ord)
+    FROM pg_index i
+    CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+    WHERE i.indrelid = to_regclass('public.jobspy_jobs')
+      AND i.indisvalid AND i.indpred IS NULL
+    GROUP BY i.indexrelid, i.indisunique
+"""
+
+
+# (columns, unique) the pipeline's queries rely on (migrations 004 and 005).
+# dbt drops them on every table rebuild unless the jobspy_jobs model declares them.
+JOBSPY_JOBS_INDEXES = [
+    (("id", "sys_profile"), True),                 # direct ingest ON CONFLICT, TOP_JOBS_SQL join
+    (("sys_profile", "date_posted", "id"), False),  # LOAD_JOBS_SQL
+]
+
+
+def _jobspy_jobs_has_index(columns: tuple[str, ...], unique: bool = False) -> bool:
+    """Whether public.jobspy_jobs has a valid index leading with `columns`.
+
+    A unique index must cover exactly `columns` (in any order), as
+    ON CONFLICT (columns) needs. The table is rebuilt by dbt, so its indexes
+    come from the data__job_searcher model config, not from this flow.
+    """
+    with get_db_engine().connect() as conn:
+        indexes = conn.execute(text(JOBSPY_JOBS_INDEXES_SQL)).fetchall()
+    for is_unique, cols in indexes:
+        if unique:
+            if is_unique and sorted(cols) == sorted(columns):
+                return True
+        elif tuple(cols[:len(columns)]) == tuple(columns):
+            return True
+    return False
+
+
+def upsert_jobspy_jobs(df: DataFrame) -> int:
+    """Dedup scraped rows straight into public.jobspy_jobs on (id, sys_profile).
+
+    Needs the unique (id, sys_profile) index; load_jobs_flow checks for it up front.
+    """
+    return upsert_dataframe(get_db_engine(), df, "public", "jobspy_jobs", ["id", "sys_profile"])
+
+
 # ---------------------------------------------------------------------------
 # Telegram
 # ---------------------------------------------------------------------------
@@ -213,87 +357,929 @@ def load_telegram_chat_id(profile: str) -> str:
     raise ValueError(f"No telegram_chat_id found for profile: {profile}")
 
 
-def _is_blocked(title: str, blocklist: list[str], threshold: int = 85) -> bool:
-    title_lower = title.lower()
-    return any(
-        fuzz.partial_ratio(title_lower, term.lower()) >= threshold
-        for term in blocklist
-    )
+def load_blocklist(profile: str) -> list[str]:
+    query = text("""
+        SELECT COALESCE(blocklist, '{}'::text[])
+        FROM adm.job_search_config
+        WHERE profile = :profile
+    """)
+    with get_db_engine().connect() as conn:
+        result = conn.execute(query, {"profile": profile}).fetchone()
+    return list(result[0]) if result else []
+
+
+def load_blocklist_rules(profile: str) -> list[dict]:
+    """Active adm.blocklist_rules of a profile, plus its legacy title blocklist
+    (adm.job_search_config.blocklist) as fuzzy title rules."""
+    query = text("""
+        SELECT field, match_type, pattern, threshold
+        FROM adm.blocklist_rules
+        WHERE profile = :profile AND is_active
+        ORDER BY id
+    """)
+    with get_db_engine().connect() as conn:
+        rules = [dict(row._mapping) for row in conn.execute(query, {"profile": profile})]
+    rules += [
+        {"field": "title", "match_type": "fuzzy", "pattern": term, "threshold": DEFAULT_FUZZY_THRESHOLD}
+        for term in load_blocklist(profile)
+    ]
+    return rules
+
+
+_BLOCKLISTS: dict[str, tuple[float, BlocklistRules]] = {}
+
+
+def profile_blocklist(profile: str) -> BlocklistRules:
+    """The profile's blocklist rules, compiled once and reused for BLOCKLIST_CACHE_SECONDS.
+
+    After that they are reloaded, so edits to adm.blocklist_rules apply
+    without a restart and the title verdict memo starts over.
+    """
+    cached = _BLOCKLISTS.get(profile)
+    if cached is None or time.monotonic() - cached[0] > BLOCKLIST_CACHE_SECONDS:
+        cached = _BLOCKLISTS[profile] = (time.monotonic(), BlocklistRules(load_blocklist_rules(profile)))
+    return cached[1]
+
+
+# Hot-path queries are module constants so scripts/check_query_plans.py can
+# EXPLAIN exactly what the pipeline runs.
+LOAD_JOBS_SQL = """
+    SELECT j.id, j.title, j.company
+    FROM public.jobspy_jobs j
+    WHERE j.sys_profile = :profile
+      AND j.date_posted >= CURRENT_DATE - MAKE_INTERVAL(hours => :hours)
+      AND NOT EXISTS (
+          SELECT 1 FROM public.evaluated_jobs e
+          WHERE e.sys_profile = j.sys_profile
+            AND e.job_id = j.id
+      )
+    ORDER BY j.id DESC
+    LIMIT :limit
+"""
+
+JOB_DESCRIPTIONS_SQL = """
+    SELECT id, description
+    FROM public.jobspy_jobs
+    WHERE sys_profile = :profile AND id = ANY(:ids)
+"""
+
+
+def iter_jobs(
+    profile: str, limit: int = 3, hours: int = 72, chunk_size: int = LOAD_JOBS_CHUNK_SIZE
+):
+    """Yield a profile's unevaluated, unblocked jobs in DataFrames of <= chunk_size rows.
+
+    Candidates stream from a server-side cursor as (id, title, company) only.
+    Company and title blocklist rules run on each chunk first; descriptions
+    are then fetched for the survivors alone, on the streaming connection,
+    and description rules applied.
+    Memory stays at one chunk of descriptions whatever the backlog size.
+    Blocked counts per rule are printed once the stream is exhausted.
+    """
+    blocklist = profile_blocklist(profile)
+    removed: dict[str, int] = {}
+    params = {"profile": profile, "limit": limit, "hours": hours}
+    with get_db_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(text(LOAD_JOBS_SQL), params)
+        for rows in result.partitions(chunk_size):
+            jobs = pd.DataFrame(rows, columns=list(result.keys()))
+            if blocklist:
+                jobs, blocked = blocklist.filter(jobs, fields=("company", "title"))
+                for rule, count in blocked.items():
+                    removed[rule] = removed.get(rule, 0) + count
+            if jobs.empty:
+                continue
+
+            # Same connection as the open server-side cursor: one pooled connection per stream
+            descriptions = dict(conn.execute(
+                text(JOB_DESCRIPTIONS_SQL), {"profile": profile, "ids": jobs["id"].tolist()}
+            ).fetchall())
+            jobs.insert(1, "description", jobs["id"].map(descriptions))
+            if blocklist:
+                jobs, blocked = blocklist.filter(jobs, fields=("description",))
+                for rule, count in blocked.items():
+                    removed[rule] = removed.get(rule, 0) + count
+            if not jobs.empty:
+                yield jobs.reset_index(drop=True)
+
+    if removed:
+        print(f"Blocked {sum(removed.values())} jobs for {profile} via blocklist rules")
+        for rule, count in sorted(removed.items(), key=lambda kv: -kv[1]):
+            print(f"  {count:>5}  {rule}")
 
 
 def load_jobs(profile: str, limit: int = 3, hours: int = 72) -> pd.DataFrame:
+    """All of iter_jobs in one DataFrame (id, description, title, company)."""
+    chunks = list(iter_jobs(profile, limit=limit, hours=hours))
+    if not chunks:
+        return pd.DataFrame(columns=["id", "description", "title", "company"])
+    return pd.concat(chunks, ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Scrape watermarks
+# ---------------------------------------------------------------------------
+
+def _load_watermark(site: str, query: dict) -> datetime | None:
+    """Last scrape of the query's (site, title, location), or None for the full window.
+
+    None as well when the query targets a profile that was not among the
+    targets of that scrape, so a newly added profile gets its backlog.
+    """
+    title, location = query_key(query)
+    sql = text("""
+        SELECT last_scraped_at, profiles
+        FROM jobspy.scrape_watermark
+        WHERE site = :site AND title = :title AND location = :location
+    """)
+    with get_db_engine().connect() as conn:
+        row = conn.execute(sql, {"site": site, "title": title, "location": location}).fetchone()
+    if row is None:
+        return None
+    last_scraped_at, profiles = row
+    added = set(query["targets"]) - set(profiles)
+    if added:
+        print(f"New profile(s) {sorted(added)} for {site} '{query['title']}' in {query['location']} — ignoring watermark")
+        return None
+    return last_scraped_at
+
+
+def _save_watermark(site: str, query: dict, scraped_at: datetime) -> None:
+    title, location = query_key(query)
+    sql = text("""
+        INSERT INTO jobspy.scrape_watermark (site, title, location, last_scraped_at, profiles)
+        VALUES (:site, :title, :location, :scraped_at, :profiles)
+        ON CONFLICT (site, title, location) DO UPDATE
+          SET last_scraped_at = GREATEST(scrape_watermark.last_scraped_at, EXCLUDED.last_scraped_at),
+              profiles = EXCLUDED.profiles
+    """)
+    params = {
+        "site": site, "title": title, "location": location,
+        "scraped_at": scraped_at, "profiles": sorted(query["targets"]),
+    }
+    with get_db_engine().connect() as conn:
+        conn.execute(sql, params)
+        conn.commit()
+
+
+def _hours_old_since(last_scraped_at: datetime | None, now: datetime) -> int:
+    """hours_old covering the gap since the last watermark plus SCRAPE_OVERLAP_HOURS.
+
+    Never less than SCRAPE_MIN_HOURS_OLD nor more than SCRAPE_MAX_HOURS_OLD.
+    """
+    if last_scraped_at is None:
+        return SCRAPE_MAX_HOURS_OLD
+    gap = (now - last_scraped_at).total_seconds() / 3600
+    hours = max(SCRAPE_MIN_HOURS_OLD, math.ceil(gap + SCRAPE_OVERLAP_HOURS))
+    return max(1, min(SCRAPE_MAX_HOURS_OLD, hours))
+
+
+# ---------------------------------------------------------------------------
+# Scrape yield / adaptive budgets
+# ---------------------------------------------------------------------------
+
+def _count_new_unique(jobs: DataFrame) -> int:
+    """Scraped job ids not already deduped into public.jobspy_jobs (any profile)."""
+    if jobs.empty or "id" not in jobs:
+        return len(jobs)
+    ids = [str(i) for i in jobs["id"].dropna().unique()]
+    query = text("SELECT DISTINCT id FROM public.jobspy_jobs WHERE id = ANY(:ids)")
+    with get_db_engine().connect() as conn:
+        known = {row[0] for row in conn.execute(query, {"ids": ids})}
+    return len(set(ids) - known)
+
+
+def _count_new_unique_or_none(jobs: DataFrame) -> int | None:
+    try:
+        return _count_new_unique(jobs)
+    except Exception as e:
+        print(f"WARNING: could not count new jobs for yield stats: {type(e).__name__}: {e}")
+        return None
+
+
+def _record_yield(
+    site: str, query: dict, run_name: str, results_wanted: int,
+    scraped_rows: int, new_unique: int,
+) -> None:
+    title, location = query_key(query)
+    sql = text("""
+        INSERT INTO jobspy.scrape_yield
+            (site, title, location, sys_run_name, results_wanted, scraped_rows, new_unique)
+        VALUES (:site, :title, :location, :run_name, :results_wanted, :scraped_rows, :new_unique)
+    """)
+    with get_db_engine().connect() as conn:
+        conn.execute(sql, {
+            "site": site, "title": title, "location": location, "run_name": run_name,
+            "results_wanted": results_wanted, "scraped_rows": scraped_rows, "new_unique": new_unique,
+        })
+        conn.commit()
+
+
+def load_yield_stats(days: int = SCRAPE_YIELD_DAYS) -> pd.DataFrame:
+    """Per (site, title, location) scraped rows, new unique jobs and yield rate.
+
+    Reads jobspy.scrape_yield_stats(days) from migrations/003.
+    """
     query = text("""
-        SELECT j.id, j.description, j.title, j.company,
-               COALESCE(c.blocklist, '{}'::text[]) AS blocklist
-        FROM public.jobspy_jobs j
-        LEFT JOIN adm.job_search_config c ON c.profile = j.sys_profile
-        WHERE j.sys_profile = :profile
-          AND j.date_posted >= CURRENT_DATE - MAKE_INTERVAL(hours => :hours)
+        SELECT site, title, location, runs, scraped_rows, new_unique, yield_rate, last_budget
+        FROM jobspy.scrape_yield_stats(:days)
+        ORDER BY yield_rate DESC NULLS LAST
+    """)
+    with get_db_engine().connect() as conn:
+        return pd.read_sql_query(query, conn, params={"days": days})
+
+
+def plan_scrape_budgets(queries: list[dict], sites: list[str] | None = None) -> pd.DataFrame:
+    """Set query["budgets"] per site from yield history; returns the allocation.
+
+    Without yield history (migration 003 not applied) the queries keep their
+    configured `searches`.
+    """
+    sites = sites or SCRAPE_SITES
+    if not queries:
+        print("Adaptive budget: no queries to plan")
+        return pd.DataFrame()
+    try:
+        stats = load_yield_stats()
+    except Exception as e:
+        print(f"WARNING: could not load scrape yield (migration 003 applied?): {e} — using configured searches")
+        return pd.DataFrame()
+    history = {
+        (r.site, r.title, r.location): (int(r.scraped_rows), int(r.new_unique))
+        for r in stats.itertuples()
+    }
+    allocation = pd.DataFrame(allocate_budgets(
+        queries, sites, history,
+        total=SCRAPE_TOTAL_BUDGET, floor=SCRAPE_MIN_RESULTS, cap=SCRAPE_MAX_RESULTS,
+    ))
+    print(
+        f"Adaptive budget: {allocation['budget'].sum()} results across {len(allocation)} "
+        f"site × query pairs ({len(history)} with history)"
+    )
+    print(allocation.sort_values("budget", ascending=False).to_string(index=False))
+    return allocation
+
+
+# ---------------------------------------------------------------------------
+# import_jobs partitions (migrations/006_partition_import_jobs.sql)
+# ---------------------------------------------------------------------------
+
+def _ensure_import_jobs_partitions() -> None:
+    """Create today's and tomorrow's import_jobs partitions before scraping.
+
+    Tomorrow's covers runs that cross midnight. Anything outside lands in
+    import_jobs_default and is moved out the next time its day is ensured.
+    """
+    try:
+        with get_db_engine().begin() as conn:
+            conn.execute(text("""
+                SELECT jobspy.ensure_import_jobs_partition(CURRENT_DATE),
+                       jobspy.ensure_import_jobs_partition(CURRENT_DATE + 1)
+            """))
+    except Exception as e:
+        print(f"WARNING: could not ensure import_jobs partitions (migration 006 applied?): {e}")
+
+
+def _import_jobs_partitions() -> list[dict]:
+    """Attached import_jobs partitions with their upper bound (None for default)."""
+    query = text("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'jobspy.import_jobs'::regclass
+        ORDER BY c.relname
+    """)
+    with get_db_engine().connect() as conn:
+        rows = conn.execute(query).fetchall()
+    partitions = []
+    for name, bound in rows:
+        upper = re.search(r"TO \('(\d{4}-\d{2}-\d{2})'\)", bound)
+        partitions.append({
+            "name": name,
+            "upper": datetime.strptime(upper.group(1), "%Y-%m-%d").date() if upper else None,
+        })
+    return partitions
+
+
+def _split_default_partition(before) -> list[str]:
+    """Move import_jobs_default rows dated before `before` into their own day partitions.
+
+    Rows written while their day's partition did not exist yet (a writer that
+    skipped _ensure_import_jobs_partitions) land in the default partition,
+    which is never pruned itself. Returns the partitions created or filled.
+    """
+    with get_db_engine().begin() as conn:
+        days = conn.execute(text("""
+            SELECT DISTINCT sys_scraped_date FROM jobspy.import_jobs_default
+            WHERE sys_scraped_date < :before
+            ORDER BY 1
+        """), {"before": before}).scalars().all()
+        return [
+            conn.execute(text("SELECT jobspy.ensure_import_jobs_partition(:d)"), {"d": d}).scalar()
+            for d in days
+        ]
+
+
+def _undeduped_rows(partition: str) -> int:
+    """Rows of a partition with no matching (id, sys_profile) in public.jobspy_jobs."""
+    query = text(f"""
+        SELECT COUNT(*)
+        FROM jobspy."{partition}" p
+        WHERE p.id IS NOT NULL
           AND NOT EXISTS (
-              SELECT 1 FROM public.evaluated_jobs e
-              WHERE e.job_id = j.id
+              SELECT 1 FROM public.jobspy_jobs j
+              WHERE j.id = p.id AND j.sys_profile = p.sys_profile
           )
-        ORDER BY j.id DESC
-        LIMIT :limit
     """)
     with get_db_engine().connect() as conn:
-        df = pd.read_sql_query(query, conn, params={"profile": profile, "limit": limit, "hours": hours})
+        return conn.execute(query).scalar()
+
+
+def _pruned_import_jobs_partitions() -> list[str]:
+    """Partitions prune_import_jobs_flow has dropped or archived, oldest first."""
+    with get_db_engine().connect() as conn:
+        return conn.execute(text(
+            "SELECT partition_name FROM jobspy.import_jobs_pruned ORDER BY upper_bound"
+        )).scalars().all()
 
-    if df.empty:
-        return df
 
-    blocklist = df["blocklist"].iloc[0] or []
-    if blocklist:
-        before = len(df)
-        df = df[~df["title"].apply(lambda t: _is_blocked(str(t), blocklist))]
-        blocked = before - len(df)
-        if blocked:
-            print(f"Blocked {blocked} jobs for {profile} via fuzzy blocklist")
+# ---------------------------------------------------------------------------
+# Two-phase LinkedIn scrape (listings first, descriptions for survivors)
+# ---------------------------------------------------------------------------
 
-    return df.drop(columns=["blocklist"])
+# DataFrame columns a LinkedIn detail page fills in, as scrape_jobs flattens them
+_LINKEDIN_DETAIL_COLUMNS = (
+    "description", "emails", "job_type", "job_level", "job_function", "company_industry",
+    "company_logo", "job_url_direct", "interval", "min_amount", "max_amount", "currency",
+    "salary_source",
+)
+_LINKEDIN_PAY_COLUMNS = ("interval", "min_amount", "max_amount", "currency", "salary_source")
+
+
+def _known_details(jobs: DataFrame) -> dict[str, dict]:
+    """Stored detail columns of scraped rows already in public.jobspy_jobs, by id or URL.
+
+    Only rows with a stored description count as known.
+    """
+    ids = [str(i) for i in jobs["id"]]
+    urls = [str(u) for u in jobs["job_url"]]
+    query = text("""
+        SELECT DISTINCT ON (id) id, job_url, to_jsonb(j) AS row
+        FROM public.jobspy_jobs j
+        WHERE (id = ANY(:ids) OR job_url = ANY(:urls))
+          AND description IS NOT NULL
+        ORDER BY id
+    """)
+    with get_db_engine().connect() as conn:
+        rows = conn.execute(query, {"ids": ids, "urls": urls}).fetchall()
+    stored = [
+        (job_id, url, {k: v for k, v in row.items() if k in _LINKEDIN_DETAIL_COLUMNS})
+        for job_id, url, row in rows
+    ]
+    by_id = {job_id: details for job_id, _, details in stored}
+    by_url = {url: details for _, url, details in stored if url}
+
+    known = {}
+    for job_id, url in zip(ids, urls):
+        details = by_id.get(job_id) or by_url.get(url)
+        if details:
+            known[job_id] = details
+    return known
+
+
+def _flatten_linkedin_details(page: dict, country: str) -> dict:
+    """A LinkedIn detail dict mapped to DataFrame columns the way scrape_jobs does it.
+
+    Joins emails and job types, spreads compensation into interval / amounts /
+    currency, and (for the USA, like scrape_jobs) falls back to the salary
+    jobspy finds in the description. Detail pages without emails (older
+    jobspy) get them extracted from the description, as scrape_jobs does.
+    """
+    from jobspy.model import Country, SalarySource
+    from jobspy.util import extract_emails_from_text, extract_salary
+
+    row = {k: v for k, v in page.items() if k in _LINKEDIN_DETAIL_COLUMNS}
+    if page.get("job_type"):
+        row["job_type"] = ", ".join(job_type.value[0] for job_type in page["job_type"])
+    emails = page.get("emails") or extract_emails_from_text(page.get("description") or "")
+    row["emails"] = ", ".join(emails) if emails else None
+    row |= dict.fromkeys(("interval", "min_amount", "max_amount", "currency", "salary_source"))
+    if compensation := page.get("compensation"):
+        compensation = dict(compensation.model_dump() if hasattr(compensation, "model_dump") else compensation)
+        interval = compensation.pop("interval", None)
+        row |= {k: compensation.get(k) for k in ("min_amount", "max_amount", "currency")}
+        row["interval"] = getattr(interval, "value", interval)
+        row["salary_source"] = SalarySource.DIRECT_DATA.value
+    elif Country.from_string(country) == Country.USA:
+        row["interval"], row["min_amount"], row["max_amount"], row["currency"] = extract_salary(
+            row.get("description")
+        )
+        row["salary_source"] = SalarySource.DESCRIPTION.value
+    if not (row["min_amount"] or row["max_amount"]):
+        row["salary_source"] = None
+    return row
+
+
+def _fetch_linkedin_details(
+    job_ids: list[str], country: str, into: dict, stop: threading.Event | None = None,
+) -> dict[str, dict]:
+    """Fetch LinkedIn detail pages for the given "li-<id>" job ids, flattened to columns.
+
+    Goes through jobspy's LinkedIn scraper internals (the same call
+    linkedin_fetch_description makes per listing), sleeping the scraper's
+    delay + band_delay between pages as its own paging does. Each page is
+    added to `into` as soon as it is parsed, so a caller that stops waiting
+    keeps what was fetched; setting `stop` ends the loop at the next page.
+    Raises AttributeError when the installed jobspy has neither known
+    detail method.
+    """
+    from jobspy.linkedin import LinkedIn
+    from jobspy.model import DescriptionFormat, ScraperInput, Site
+
+    scraper = LinkedIn()
+    scraper.scraper_input = ScraperInput(
+        site_type=[Site.LINKEDIN], description_format=DescriptionFormat.MARKDOWN
+    )
+    fetch = getattr(scraper, "_fetch_details", None) or getattr(scraper, "_get_job_details")
+    delay, band_delay = getattr(scraper, "delay", 3), getattr(scraper, "band_delay", 4)
+    for n, job_id in enumerate(job_ids):
+        if stop is not None and stop.is_set():
+            break
+        if n:
+            time.sleep(random.uniform(delay, delay + band_delay))
+        into[job_id] = _flatten_linkedin_details(fetch(job_id.removeprefix("li-")) or {}, country)
+    return into
+
+
+def _hydrate_linkedin_listings(jobs: DataFrame, query: dict, country: str) -> DataFrame:
+    """Second phase of a two-phase LinkedIn scrape.
+
+    Drops listings whose title or company is blocked for every profile
+    interested in the query, fills the detail columns (description, pay,
+    job type, ...) of jobs already in public.jobspy_jobs from the DB, and
+    fetches detail pages only for the remaining unseen jobs. Pay the
+    listing card already had is kept. The fetches hold a linkedin slot and
+    are bounded by its SITE_SCRAPE_POLICY timeout; on timeout the pages
+    fetched so far are used and the rest keep their listing columns only.
+    """
+    if jobs.empty:
+        return jobs
+
+    blocklists = [profile_blocklist(profile) for profile in query["targets"]]
+    if all(blocklists):
+        blocked = np.logical_and.reduce([
+            bl.first_match(jobs, fields=("company", "title")) >= 0 for bl in blocklists
+        ])
+        jobs = jobs[~blocked]
+
+    known = _known_details(jobs) if not jobs.empty else {}
+    unseen = [str(i) for i in jobs["id"] if str(i) not in known]
+    fetched, stop = {}, threading.Event()
+    if unseen:
+        try:
+            _call_with_timeout(
+                lambda: _fetch_linkedin_details(unseen, country, fetched, stop),
+                SITE_SCRAPE_POLICY["linkedin"]["timeout"],
+                sites=["linkedin"],
+            )
+        except TimeoutError as e:
+            stop.set()  # lets the abandoned fetch thread return its linkedin slot
+            print(
+                f"WARNING: linkedin detail fetches for '{query['title']}' in {query['location']} "
+                f"timed out ({e}) — keeping {len(fetched)}/{len(unseen)} fetched pages"
+            )
+    details = {**known, **fetched}
+
+    jobs = jobs.copy()
+    has_pay = jobs.reindex(columns=["min_amount", "max_amount"]).notna().any(axis=1)
+    for col in _LINKEDIN_DETAIL_COLUMNS:
+        detail = jobs["id"].map(lambda i: details.get(str(i), {}).get(col))
+        if col not in jobs:
+            jobs[col] = detail
+        elif col in _LINKEDIN_PAY_COLUMNS:
+            jobs[col] = jobs[col].where(has_pay | detail.isna(), detail)
+        else:
+            jobs[col] = detail.where(detail.notna(), jobs[col])
+    print(
+        f"Two-phase linkedin '{query['title']}' in {query['location']}: "
+        f"{len(known)} known, {len(fetched)}/{len(unseen)} detail fetches"
+    )
+    return jobs
 
 
 # ---------------------------------------------------------------------------
-# Prefect tasks
+# Scrape concurrency
 # ---------------------------------------------------------------------------
 
-@task()
-def find_and_process(
-    title: str, location: str, profile: str, searches: int = 70
+def _parse_site_limits(spec: str) -> dict[str, int]:
+    """Parse "site=n,site=n" into {site: n}. Unlisted sites fall back to SCRAPE_CONCURRENCY."""
+    limits = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        site, n = part.split("=", 1)
+        limits[site.strip()] = max(1, int(n))
+    return limits
+
+
+_SITE_LIMITS = _parse_site_limits(SCRAPE_SITE_CONCURRENCY)
+_SITE_SEMAPHORES = {
+    site: threading.BoundedSemaphore(_SITE_LIMITS.get(site, SCRAPE_CONCURRENCY))
+    for site in SCRAPE_SITES
+}
+
+
+def _site_semaphores(sites: list[str]) -> list[tuple[str, threading.BoundedSemaphore]]:
+    return [(site, _SITE_SEMAPHORES[site]) for site in sorted(sites) if site in _SITE_SEMAPHORES]
+
+
+class _JobspyErrorLog(logging.Handler):
+    """Counts the errors a jobspy scraper logs instead of raising.
+
+    jobspy's LinkedIn scraper logs a 429, any other non-2xx answer or a
+    proxy error and returns the jobs it has so far, without an exception.
+    """
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+        self.last = ""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+        self.last = record.getMessage()
+
+
+_LINKEDIN_ERRORS = _JobspyErrorLog()
+logging.getLogger("JobSpy:LinkedIn").addHandler(_LINKEDIN_ERRORS)
+
+
+class SoftBlockError(RuntimeError):
+    """A scrape came back short while the job board was throttling or blocking it."""
+
+
+def _call_with_timeout(fn, timeout: float, sites: list[str] = (), late: list | None = None):
+    """Run fn() in a worker thread and give up waiting after timeout seconds.
+
+    The thread cannot be killed, so a timed-out scrape keeps running in the
+    background until it returns on its own. The concurrency slots of `sites`
+    are held until it does, so it still counts against its sites' limits.
+    Waiting for those slots counts against the same timeout: a site whose
+    slots are all held by hung scrapes raises TimeoutError instead of
+    blocking forever.
+
+    `late` collects the futures of earlier timed-out attempts at the same
+    call. Once the slots are free, if one of them has since returned, its
+    result is used instead of running fn again; a future that times out
+    here is appended to it. A TimeoutError raised by fn itself propagates
+    unchanged.
+    """
+    deadline = time.monotonic() + timeout
+    held = []
+    try:
+        for site, sem in _site_semaphores(sites):
+            if not sem.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise TimeoutError(f"no free {site} scrape slot within {timeout}s")
+            held.append(sem)
+        finished = next((f for f in late or [] if f.done() and f.exception() is None), None)
+        if finished is not None:
+            for sem in held:
+                sem.release()
+            print("Using the result of an earlier attempt that finished after its timeout")
+            return finished.result()
+        pool = ThreadPoolExecutor(max_workers=1)
+        future = pool.submit(fn)
+    except BaseException:
+        for sem in held:
+            sem.release()
+        raise
+    future.add_done_callback(lambda _: [sem.release() for sem in held])
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except TimeoutError:
+        if future.done():
+            raise  # raised by fn itself (e.g. a read timeout), not our deadline
+        if late is not None:
+            late.append(future)
+        raise TimeoutError(f"no result within {timeout}s") from None
+    finally:
+        pool.shutdown(wait=False)
+
+
+def _scrape_site(
+    site: str, title: str, location: str, searches: int, country: str,
+    hours_old: int = SCRAPE_MAX_HOURS_OLD, fetch_description: bool = True,
 ) -> DataFrame:
-    country = _country_for_location(location)
+    """Scrape a single site with its own timeout and retry/backoff policy.
+
+    Each attempt, including its wait for a site slot, is bounded by the
+    policy's timeout. A retry returns the result of a timed-out attempt that
+    has finished in the meantime rather than scraping again.
+    A LinkedIn result short of `searches` while jobspy logged an error counts
+    as a failed attempt (SoftBlockError): jobspy stops paging on a 429 or a
+    blocked page instead of raising. The error count is shared by concurrent
+    LinkedIn scrapes, which are throttled together anyway.
+    Raises the last error once retries are exhausted.
+    """
+    policy = SITE_SCRAPE_POLICY.get(site, {"timeout": 300, "retries": 2, "backoff": 10})
+    attempts = policy["retries"] + 1
+    late = []
+    for attempt in range(attempts):
+        errors_before = _LINKEDIN_ERRORS.count
+        try:
+            jobs = _call_with_timeout(
+                lambda: scrape_jobs(
+                    site_name=[site],
+                    search_term=title,
+                    google_search_term=f"{title} jobs near {location} since yesterday",
+                    location=location,
+                    results_wanted=searches,
+                    hours_old=hours_old,
+                    country_indeed=country,
+                    linkedin_fetch_description=fetch_description,
+                ),
+                policy["timeout"],
+                sites=[site],
+                late=late,
+            )
+            if site == "linkedin" and len(jobs) < searches and _LINKEDIN_ERRORS.count > errors_before:
+                raise SoftBlockError(f"{len(jobs)}/{searches} rows, jobspy logged: {_LINKEDIN_ERRORS.last}")
+            return jobs
+        except Exception as e:
+            if attempt + 1 == attempts:
+                raise
+            delay = policy["backoff"] * 2 ** attempt
+            print(
+                f"WARNING: {site} scrape failed for '{title}' in {location} "
+                f"(attempt {attempt + 1}/{attempts}): {type(e).__name__}: {e} — retrying in {delay}s"
+            )
+            time.sleep(delay)
+
+
+def _scrape_and_store_site(
+    site: str, query: dict, country: str, run_name: str,
+    use_watermarks: bool = True, two_phase: bool = False, direct_ingest: bool = False,
+) -> dict:
+    """Scrape one site and persist its slice to jobspy.import_jobs on its own.
+
+    Rows are copied once per interested profile (see scrape_plan.fan_out_rows)
+    and also kept in the local parquet cache (see scrape_cache).
+    results_wanted comes from query["budgets"][site] when an adaptive budget
+    was planned, else query["searches"]; the yield of every scrape is recorded
+    in jobspy.scrape_yield. With use_watermarks, only postings newer than the
+    last successful scrape of this (site, title, location) are requested, and
+    the watermark is moved to this scrape's start time once its rows are stored.
+    A scrape that returned no rows leaves the watermark alone: jobspy returns
+    an empty frame rather than raising when a board throttles or blocks it.
+    With two_phase, LinkedIn listings are pulled without descriptions and
+    hydrated by _hydrate_linkedin_listings. With direct_ingest, rows are also
+    upserted into public.jobspy_jobs so they can be queued before dbt runs.
+    """
+    title, location = query["title"], query["location"]
+    stats = {"site": site, "status": "ok", "rows": 0, "stored": 0, "error": None, "seconds": 0.0}
+    started = time.monotonic()
     try:
-        jobs = scrape_jobs(
-            site_name=["indeed", "linkedin", "google"],
-            search_term=title,
-            google_search_term=f"{title} jobs near {location} since yesterday",
-            location=location,
-            results_wanted=searches,
-            hours_old=72,
-            country_indeed=country,
-            linkedin_fetch_description=True,
+        scraped_at = datetime.now(timezone.utc)
+        last = _load_watermark(site, query) if use_watermarks else None
+        stats["hours_old"] = _hours_old_since(last, scraped_at)
+        results_wanted = query.get("budgets", {}).get(site, query["searches"])
+        two_phase = two_phase and site == "linkedin"
+        jobs = _scrape_site(
+            site, title, location, results_wanted, country, stats["hours_old"],
+            fetch_description=not two_phase,
         )
+        stats["rows"] = len(jobs)
+        # Counted before direct_ingest upserts these ids into jobspy_jobs
+        stats["new_unique"] = _count_new_unique_or_none(jobs)
+        if two_phase:
+            try:
+                jobs = _hydrate_linkedin_listings(jobs, query, country)
+            except (ImportError, AttributeError) as e:
+                print(f"WARNING: two-phase linkedin unsupported by installed jobspy ({e}) — rescraping with descriptions")
+                jobs = _scrape_site(site, title, location, results_wanted, country, stats["hours_old"])
+        jobs = fan_out_rows(jobs, query)
+        jobs["sys_run_name"] = run_name
+        # Cached before any write, so a slice whose DB write fails can still be replayed
+        save_scrape(jobs, run_name, site, query, scraped_at)
+        write_to_db(jobs, "jobspy", "import_jobs")
+        stats["stored"] = len(jobs)
+        if direct_ingest:
+            # The rows are already in import_jobs and dbt still publishes them,
+            # so a failed upsert must not skip the watermark or the yield
+            try:
+                stats["upserted"] = upsert_jobspy_jobs(jobs)
+            except Exception as e:
+                stats["upserted"] = None
+                print(f"WARNING: could not upsert {site} rows for '{title}' in {location} into jobspy_jobs: {type(e).__name__}: {e}")
+        if stats["rows"]:
+            _save_watermark(site, query, scraped_at)
+        elif use_watermarks:
+            print(f"No {site} rows for '{title}' in {location} — keeping the previous watermark")
     except Exception as e:
-        print(f"WARNING: scrape failed for '{title}' in {location}: {e}")
-        return DataFrame()
-    jobs["sys_run_name"] = runtime.flow_run.name
-    jobs["sys_profile"] = profile
+        print(f"WARNING: {site} scrape failed for '{title}' in {location}: {type(e).__name__}: {e}")
+        stats["status"] = "failed"
+        stats["error"] = f"{type(e).__name__}: {e}"
+    else:
+        # Yield stats only steer future budgets: never fail a stored scrape over them
+        if stats["new_unique"] is not None:
+            try:
+                _record_yield(site, query, run_name, results_wanted, stats["rows"], stats["new_unique"])
+            except Exception as e:
+                print(f"WARNING: could not record {site} yield for '{title}' in {location}: {type(e).__name__}: {e}")
+    stats["seconds"] = round(time.monotonic() - started, 1)
+    return stats
+
+
+def _replay_cached_scrapes(source_run: str, run_name: str, direct_ingest: bool = False) -> int:
+    """Write a cached run's scrapes to jobspy.import_jobs under run_name, without network."""
+    total = 0
+    for name, jobs in load_cached_run(source_run):
+        jobs["sys_run_name"] = run_name
+        write_to_db(jobs, "jobspy", "import_jobs")
+        if direct_ingest:
+            upsert_jobspy_jobs(jobs)
+        total += len(jobs)
+        print(f"Replayed {len(jobs)} rows from {name}")
+    print(f"Replayed {total} cached rows from run {source_run}")
+    return total
+
+
+def _report_scrape_stats(stats: list[dict]) -> None:
+    ok = [s for s in stats if s["status"] == "ok"]
+    partial = [s for s in stats if s["status"] == "partial"]
+    failed = [s for s in stats if s["status"] == "failed"]
+    rows = sum(s["rows"] for s in stats)
+    print(
+        f"Scrape finished: {len(ok)}/{len(stats)} combos ok, {len(partial)} partial, "
+        f"{len(failed)} failed, {rows} rows"
+    )
+    for s in partial + failed:
+        for site, site_stats in s["sites"].items():
+            if site_stats["status"] == "failed":
+                print(f"  FAILED {'/'.join(s['profiles'])}: {site} '{s['title']}' in {s['location']} — {site_stats['error']}")
+
+
+# ---------------------------------------------------------------------------
+# Prefect tasks
+# ---------------------------------------------------------------------------
+
+def _scrape_query(
+    query: dict, sites: list[str] | None = None,
+    use_watermarks: bool = True, two_phase: bool = False, direct_ingest: bool = False,
+) -> dict:
+    """Scrape one planned query (see scrape_plan) into jobspy.import_jobs.
 
-    print(f"Found {len(jobs)} jobs for '{title}' in {location}")
-    write_to_db(jobs, "jobspy", "import_jobs")
-    return jobs.head()
+    Each site is scraped in parallel with its own timeout/retry policy and
+    written as soon as it finishes, so one rate-limited board only loses its
+    own slice. Never raises — returns a stats dict with status "ok",
+    "partial" or "failed" plus per-site stats under "sites".
+    """
+    sites = sites or SCRAPE_SITES
+    title, location = query["title"], query["location"]
+    run_name = runtime.flow_run.name
+    country = _country_for_location(location)
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=len(sites)) as pool:
+        futures = {
+            site: pool.submit(
+                _scrape_and_store_site,
+                site, query, country, run_name, use_watermarks, two_phase, direct_ingest,
+            )
+            for site in sites
+        }
+        site_stats = {site: f.result() for site, f in futures.items()}
+
+    ok_sites = [site for site, st in site_stats.items() if st["status"] == "ok"]
+    rows = sum(st["rows"] for st in site_stats.values())
+    status = "ok" if len(ok_sites) == len(sites) else "partial" if ok_sites else "failed"
+    print(f"Found {rows} jobs for '{title}' in {location} ({', '.join(ok_sites) or 'no sites'} ok)")
+    return {
+        "profiles": list(query["targets"]),
+        "title": title,
+        "location": location,
+        "status": status,
+        "rows": rows,
+        "sites": site_stats,
+        "seconds": round(time.monotonic() - started, 1),
+    }
+
+
+@task()
+def scrape_query(
+    query: dict, sites: list[str] | None = None,
+    use_watermarks: bool = True, two_phase: bool = False, direct_ingest: bool = False,
+) -> dict:
+    return _scrape_query(query, sites, use_watermarks, two_phase, direct_ingest)
 
 
 @task()
-def run_dbt():
-    vars_json = f'{{"run_name": "{runtime.flow_run.name}"}}'
+def find_and_process(
+    title: str, location: str, profile: str, searches: int = 70,
+    sites: list[str] | None = None,
+) -> dict:
+    """Scrape one title × location combo for a single profile."""
+    return _scrape_query(single_profile_query(title, location, profile, searches), sites)
+
+
+def _dbt_timings(project_dir: str = DBT_PROJECT_DIR) -> list[dict]:
+    """Per-node timing from the last dbt invocation's run_results.json, slowest first."""
+    path = Path(project_dir) / "target" / "run_results.json"
+    if not path.exists():
+        return []
+    timings = []
+    for result in json.loads(path.read_text())["results"]:
+        phases = {}
+        for t in result.get("timing", []):
+            if t.get("started_at") and t.get("completed_at"):
+                started = datetime.fromisoformat(t["started_at"].replace("Z", "+00:00"))
+                completed = datetime.fromisoformat(t["completed_at"].replace("Z", "+00:00"))
+                phases[t["name"]] = round((completed - started).total_seconds(), 2)
+        timings.append({
+            "node": result["unique_id"],
+            "status": result["status"],
+            "seconds": round(result.get("execution_time") or 0, 2),
+            "compile": phases.get("compile"),
+            "execute": phases.get("execute"),
+        })
+    return sorted(timings, key=lambda t: t["seconds"], reverse=True)
+
+
+def _jobspy_jobs_config(project_dir: str = DBT_PROJECT_DIR) -> dict:
+    """Config of the jobspy_jobs model per the dbt manifest ({} if absent).
+
+    Runs `dbt parse` first when the project has not been compiled in this
+    container yet.
+    """
+    path = Path(project_dir) / "target" / "manifest.json"
+    if not path.exists():
+        PrefectDbtRunner(
+            settings=PrefectDbtSettings(project_dir=project_dir, profiles_dir=project_dir)
+        ).invoke(["parse"])
+    if not path.exists():
+        return {}
+    for node in json.loads(path.read_text())["nodes"].values():
+        if node["resource_type"] == "model" and node["name"] == "jobspy_jobs":
+            return node["config"]
+    return {}
+
+
+def _jobspy_jobs_is_incremental_on(key: list[str]) -> bool:
+    """Whether the jobspy_jobs model is incremental with exactly `key` as unique_key."""
+    config = _jobspy_jobs_config()
+    unique_key = config.get("unique_key") or []
+    if isinstance(unique_key, str):
+        unique_key = [unique_key]
+    return config.get("materialized") == "incremental" and sorted(unique_key) == sorted(key)
+
+
+@task()
+def run_dbt(select: str | None = DBT_SELECT, full_refresh: bool = False) -> list[dict]:
+    """dbt build scoped to `select` (None = whole project), with this flow run's name as var run_name.
+
+    Only the selection changes here: whether a model processes just this
+    run's import_jobs rows is up to the dbt project, which has to filter on
+    var("run_name") itself (see PIPELINE.md, Selective dbt Builds). Raises
+    when the build did not include the jobspy_jobs model, e.g. because
+    `select` matched nothing, so public.jobspy_jobs cannot silently go
+    stale. Warns when the build left public.jobspy_jobs without
+    JOBSPY_JOBS_INDEXES. Returns and prints the per-node timing breakdown.
+    """
+    vars_json = json.dumps({"run_name": runtime.flow_run.name})
     cli_args = ["build", "--vars", vars_json]
+    if select:
+        cli_args += ["--select", select]
+    if full_refresh:
+        cli_args.append("--full-refresh")
     PrefectDbtRunner(
         settings=PrefectDbtSettings(
-            project_dir="data__job_searcher", profiles_dir="data__job_searcher"
+            project_dir=DBT_PROJECT_DIR, profiles_dir=DBT_PROJECT_DIR
         )
     ).invoke(cli_args)
 
+    timings = _dbt_timings()
+    if not any(t["node"].startswith("model.") and t["node"].endswith(".jobspy_jobs") for t in timings):
+        raise RuntimeError(
+            f"dbt build --select {select or '(all)'} did not build the jobspy_jobs model "
+            f"({len(timings)} nodes) — check DBT_SELECT against the project's source names"
+        )
+
+    missing = [cols for cols, unique in JOBSPY_JOBS_INDEXES if not _jobspy_jobs_has_index(cols, unique)]
+    if missing:
+        print(
+            f"WARNING: public.jobspy_jobs lost indexes on {missing} after dbt build — declare them "
+            "in the data__job_searcher jobspy_jobs model config (see migrations/004 and 005)"
+        )
+
+    total = sum(t["seconds"] for t in timings)
+    print(f"dbt build ({select or 'all'}): {len(timings)} nodes in {total:.1f}s")
+    for t in timings:
+        print(
+            f"  {t['seconds']:7.2f}s  {t['status']:<7} {t['node']}"
+            f"  (compile {t['compile']}s, execute {t['execute']}s)"
+        )
+    return timings
+
 
 @task()
 def send_telegram_notifications(region_jobs, run_name: str, chat_id: str, profile: str = "", total_evaluated: int = 0):
@@ -324,6 +1310,78 @@ def send_telegram_notifications(region_jobs, run_name: str, chat_id: str, profil
 # Queue helpers
 # ---------------------------------------------------------------------------
 
+IN_FLIGHT_SQL = """
+    SELECT DISTINCT payload->>'job_id'
+    FROM llm_queue.tasks
+    WHERE topic IN ('job_extract', 'job_eval')
+      AND status IN ('pending', 'processing')
+      AND payload->>'sys_profile' = :profile
+      AND payload->>'job_id' = ANY(:job_ids)
+"""
+
+
+def _in_flight_job_ids(profile: str, job_ids: list[str]) -> set[str]:
+    """job_ids that already have a pending/processing extract or eval task for the profile."""
+    if not job_ids:
+        return set()
+    with get_queue_engine().connect() as conn:
+        rows = conn.execute(text(IN_FLIGHT_SQL), {"profile": profile, "job_ids": job_ids})
+        return {row[0] for row in rows}
+
+
+# Done job_extract tasks whose job_eval failed or was cancelled, with no
+# other job_eval for the job still live or done: their idempotency key would
+# otherwise block the job from ever being pushed again.
+RELEASE_FAILED_EVAL_KEYS_SQL = """
+    UPDATE llm_queue.tasks x
+    SET idempotency_key = NULL
+    WHERE x.idempotency_key = ANY(:keys)
+      AND x.topic = 'job_extract'
+      AND x.status = 'done'
+      AND EXISTS (
+          SELECT 1 FROM llm_queue.tasks e
+          WHERE e.topic = 'job_eval'
+            AND e.payload->>'sys_profile' = x.payload->>'sys_profile'
+            AND e.payload->>'job_id' = x.payload->>'job_id'
+            AND e.status IN ('failed', 'cancelled')
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM llm_queue.tasks e
+          WHERE e.topic = 'job_eval'
+            AND e.payload->>'sys_profile' = x.payload->>'sys_profile'
+            AND e.payload->>'job_id' = x.payload->>'job_id'
+            AND e.status IN ('pending', 'processing', 'done')
+      )
+    RETURNING x.payload->>'job_id'
+"""
+
+
+def _release_failed_eval_keys(keys: list[str]) -> set[str]:
+    """Free the keys of finished extracts whose eval failed; returns their job_ids."""
+    if not keys:
+        return set()
+    with get_queue_engine().begin() as conn:
+        return {row[0] for row in conn.execute(text(RELEASE_FAILED_EVAL_KEYS_SQL), {"keys": keys})}
+
+
+QUEUE_IDEMPOTENCY_INDEX_SQL = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = to_regclass('llm_queue.tasks')
+          AND i.indisunique AND i.indisvalid
+          AND a.attname = 'idempotency_key'
+    )
+"""
+
+
+def _queue_has_idempotency_keys() -> bool:
+    """Whether llm_queue.tasks has the idempotency_key column and unique index (queue migration 003)."""
+    with get_queue_engine().connect() as conn:
+        return conn.execute(text(QUEUE_IDEMPOTENCY_INDEX_SQL)).scalar()
+
+
 def _push_profile_to_queue(
     profile: str, resume: str, jobs_df: pd.DataFrame, run_name: str
 ) -> int:
@@ -331,12 +1389,26 @@ def _push_profile_to_queue(
 
     Pushes to job_extract (7B) which auto-creates job_eval (14B) with depends_on.
     The scheduler sees the DAG and batches by model to minimize swaps.
+    Jobs still pending or processing in either stage for this profile (a
+    re-run, or last night's queue not drained yet) are skipped. Every task
+    carries an idempotency key over (job_id, profile, eval prompt, resume), so
+    work already queued or done under the same inputs is never pushed twice;
+    keys whose job_eval failed are released first so those jobs are retried.
+    Without queue migration 003 the tasks are pushed unkeyed with a warning.
     """
-    from llm_queue import LLMQueueClient
+    from llm_queue import LLMQueueClient, idempotency_key
+
+    in_flight = _in_flight_job_ids(profile, [str(i) for i in jobs_df["id"]])
+    if in_flight:
+        jobs_df = jobs_df[~jobs_df["id"].astype(str).isin(in_flight)]
+        print(f"Skipped {len(in_flight)} jobs for {profile} already in flight in llm_queue")
+    if jobs_df.empty:
+        return 0
 
     dsn = os.getenv("LLM_QUEUE_DSN")
     worker_url = os.getenv("LLM_QUEUE_WORKER_URL")
 
+    eval_prompt = build_eval_prompt(profile)
     payloads = [
         {
             "job_id": str(job.get("id")),
@@ -351,17 +1423,46 @@ def _push_profile_to_queue(
             "next_step": {
                 "topic": "job_eval",
                 "step": "eval",
-                "prompt": build_eval_prompt(profile),
+                "prompt": eval_prompt,
                 "inputs": {"candidate_json": resume},
             },
         }
         for _, job in jobs_df.iterrows()
     ]
 
-    client = LLMQueueClient(dsn=dsn, worker_url=worker_url)
-    task_ids = client.push_batch("job_extract", payloads)
-    print(f"Pushed {len(task_ids)} jobs for {profile} to job_extract queue")
-    return len(task_ids)
+    if not _queue_has_idempotency_keys():
+        print(
+            "WARNING: llm_queue.tasks has no unique idempotency_key index "
+            "(migrations/queue/003) — pushing without idempotency keys"
+        )
+        with LLMQueueClient(dsn=dsn, worker_url=worker_url) as client:
+            client.push_batch("job_extract", payloads)
+        print(f"Pushed {len(payloads)} jobs for {profile} to job_extract queue")
+        return len(payloads)
+
+    keys = [idempotency_key(p["job_id"], profile, eval_prompt, resume) for p in payloads]
+    retried = _release_failed_eval_keys(keys)
+    if retried:
+        print(f"Re-queueing {len(retried)} jobs for {profile} whose job_eval failed")
+
+    with LLMQueueClient(dsn=dsn, worker_url=worker_url) as client:
+        pushed = client.push_batch_idempotent("job_extract", payloads, keys)
+    created = sum(1 for _, is_new in pushed if is_new)
+    print(f"Pushed {created} jobs for {profile} to job_extract queue")
+    if created < len(pushed):
+        print(
+            f"Skipped {len(pushed) - created} jobs for {profile} already queued or "
+            "evaluated under the same key (awaiting drain into evaluated_jobs)"
+        )
+    return created
+
+
+DONE_TASKS_SQL = """
+    SELECT payload, result
+    FROM llm_queue.tasks
+    WHERE topic = :topic AND status = 'done'
+      AND payload->>'sys_profile' = :profile
+"""
 
 
 def _drain_queue_results(profile: str, run_name: str) -> list[str]:
@@ -371,23 +1472,22 @@ def _drain_queue_results(profile: str, run_name: str) -> list[str]:
     """
     topic = "job_eval"
 
-    # Existing evaluated job_ids for this profile
-    existing_query = text(
-        "SELECT job_id FROM public.evaluated_jobs WHERE sys_profile = :profile"
-    )
-    with get_db_engine().connect() as conn:
-        existing = {row[0] for row in conn.execute(existing_query, {"profile": profile})}
-
     # Done tasks from queue DB
-    done_query = text("""
-        SELECT payload, result
-        FROM llm_queue.tasks
-        WHERE topic = :topic AND status = 'done'
-          AND payload->>'sys_profile' = :profile
-    """)
+    done_query = text(DONE_TASKS_SQL)
     with get_queue_engine().connect() as conn:
         rows = conn.execute(done_query, {"topic": topic, "profile": profile}).fetchall()
 
+    # Which of those job_ids this profile already has in evaluated_jobs
+    existing_query = text("""
+        SELECT job_id FROM public.evaluated_jobs
+        WHERE sys_profile = :profile AND job_id = ANY(:job_ids)
+    """)
+    job_ids = list({payload.get("job_id") for payload, _ in rows if payload.get("job_id")})
+    with get_db_engine().connect() as conn:
+        existing = {
+            row[0] for row in conn.execute(existing_query, {"profile": profile, "job_ids": job_ids})
+        }
+
     new_rows = [
         (payload, result) for payload, result in rows
         if payload.get("job_id") not in existing
@@ -430,27 +1530,30 @@ REGION_EMOJI = {"canada": "🇨🇦", "uk": "🇬🇧", "usa": "🇺🇸"}
 REGION_LABEL = {"canada": "Canada", "uk": "United Kingdom", "usa": "United States"}
 
 
+TOP_JOBS_SQL = """
+    SELECT
+        j.title, j.company, j.location,
+        e.avg_score, e.match_scores, e.reasoning,
+        COALESCE(j.job_url_direct, j.job_url) as job_url,
+        e.job_id
+    FROM public.evaluated_jobs e
+    INNER JOIN public.jobspy_jobs j ON j.id = e.job_id AND j.sys_profile = e.sys_profile
+    WHERE e.sys_profile = :profile
+      AND e.avg_score >= :min_score
+      AND e.created_at >= :since
+      AND e.notified_at IS NULL
+      AND j.date_posted >= CURRENT_DATE - INTERVAL '3 days'
+    ORDER BY e.avg_score DESC
+    LIMIT 200
+"""
+
+
 def _get_top_jobs_for_profile(
     profile: str, min_score: float = 6.9, hours: int = 48, per_region: int = 10
 ):
     """Top scored jobs per region for a profile, unsent, within the last N hours."""
     since = datetime.utcnow() - timedelta(hours=hours)
-    query = text("""
-        SELECT
-            j.title, j.company, j.location,
-            e.avg_score, e.match_scores, e.reasoning,
-            COALESCE(j.job_url_direct, j.job_url) as job_url,
-            e.job_id
-        FROM public.evaluated_jobs e
-        INNER JOIN public.jobspy_jobs j ON e.job_id = j.id
-        WHERE e.sys_profile = :profile
-          AND e.avg_score >= :min_score
-          AND e.created_at >= :since
-          AND e.notified_at IS NULL
-          AND j.date_posted >= CURRENT_DATE - INTERVAL '3 days'
-        ORDER BY e.avg_score DESC
-        LIMIT 200
-    """)
+    query = text(TOP_JOBS_SQL)
     with get_db_engine().connect() as conn:
         all_jobs = conn.execute(
             query, {"profile": profile, "min_score": min_score, "since": since}
@@ -470,16 +1573,16 @@ def _get_top_jobs_for_profile(
     return result
 
 
-def _mark_jobs_notified(job_ids: list[str]) -> None:
+def _mark_jobs_notified(profile: str, job_ids: list[str]) -> None:
     if not job_ids:
         return
     query = text("""
         UPDATE public.evaluated_jobs
         SET notified_at = NOW()
-        WHERE job_id = ANY(:job_ids)
+        WHERE sys_profile = :profile AND job_id = ANY(:job_ids)
     """)
     with get_db_engine().connect() as conn:
-        conn.execute(query, {"job_ids": job_ids})
+        conn.execute(query, {"profile": profile, "job_ids": job_ids})
         conn.commit()
 
 
@@ -487,39 +1590,147 @@ def _mark_jobs_notified(job_ids: list[str]) -> None:
 # Multi-profile queue pipeline (primary / overnight pattern)
 # ---------------------------------------------------------------------------
 
-@flow()
-def load_jobs_flow():
+def _push_unevaluated(config: dict, run_name: str) -> int:
+    """Stream a profile's unevaluated jobs from jobspy_jobs to the queue, chunk by chunk."""
+    profile = config["profile"]
+    resume, _ = load_resume(profile)
+    cap = len(config["titles"]) * len(config["locations"]) * config["searches"] * 2
+
+    loaded = pushed = 0
+    for jobs_df in iter_jobs(profile, limit=cap):
+        loaded += len(jobs_df)
+        pushed += _push_profile_to_queue(profile, resume, jobs_df, run_name)
+
+    if not loaded:
+        print(f"No unevaluated jobs for {profile}")
+    return pushed
+
+
+@flow(task_runner=ThreadPoolTaskRunner(max_workers=SCRAPE_CONCURRENCY))
+def load_jobs_flow(
+    concurrent_scrape: bool = True,
+    merge_subsumed: bool = False,
+    use_watermarks: bool = True,
+    adaptive_budget: bool = True,
+    two_phase: bool = False,
+    replay_from: str | None = None,
+    direct_ingest: bool = False,
+    full_dbt: bool = False,
+):
     """
     Scrape jobs for ALL active profiles and push to LLM queue.
     Schedule: 6 PM Toronto — queue drains overnight with local LLM.
+
+    All profiles' title × location combos are first planned into one set of
+    unique queries (scrape_plan.plan_scrape_queries); each query is scraped
+    once and its rows copied to every interested profile. With
+    concurrent_scrape, queries are submitted to the flow's thread pool
+    (SCRAPE_CONCURRENCY workers, SCRAPE_SITE_CONCURRENCY per site).
+    Set use_watermarks=False to re-request the full SCRAPE_MAX_HOURS_OLD window.
+    With adaptive_budget, results_wanted per site × query is reallocated from
+    past yield (see plan_scrape_budgets) instead of the fixed `searches`.
+    With two_phase, LinkedIn detail pages are only fetched for listings that
+    are neither already stored nor blocked for every interested profile. It
+    is off by default: it calls jobspy's private detail method, which is not
+    stable across jobspy versions.
+
+    replay_from=<run name> skips scraping entirely and loads that run's rows
+    from the local scrape cache instead (SCRAPE_CACHE_DIR), then continues
+    with dbt and the queue push as usual.
+
+    With direct_ingest, every scraped slice is also upserted into
+    public.jobspy_jobs, and each profile is pushed to the queue as soon as
+    its last query finishes (or after dbt, if that early push fails). dbt
+    then runs at the end for reporting only. The raw jobspy columns are
+    upserted by name, so until that build jobspy_jobs holds them as scraped,
+    not as dbt derives them. direct_ingest is refused unless the jobspy_jobs
+    model is incremental on (id, sys_profile); a table model is recreated
+    without the unique index on every build.
+
+    dbt only builds nodes downstream of import_jobs (DBT_SELECT) for this
+    run_name; full_dbt=True rebuilds the whole project with --full-refresh,
+    and is refused once prune_import_jobs_flow has pruned any partition.
     """
     configs = load_search_configs()
     print(f"Running for {len(configs)} profiles: {[c['profile'] for c in configs]}")
+    run_name = runtime.flow_run.name
+    pushed = set()
+    if full_dbt:
+        pruned = _pruned_import_jobs_partitions()
+        if pruned:
+            raise RuntimeError(
+                f"full_dbt would rebuild public.jobspy_jobs without the rows of pruned import_jobs "
+                f"partitions {pruned}; re-attach them from jobspy_archive and clear "
+                "jobspy.import_jobs_pruned first"
+            )
+    if direct_ingest and not _jobspy_jobs_is_incremental_on(["id", "sys_profile"]):
+        raise RuntimeError(
+            "direct_ingest needs the jobspy_jobs dbt model to be incremental with "
+            "unique_key ['id', 'sys_profile'] (see PIPELINE.md, Direct Ingest)"
+        )
+    _ensure_import_jobs_partitions()
+    if direct_ingest and not _jobspy_jobs_has_index(("id", "sys_profile"), unique=True):
+        print(
+            "WARNING: public.jobspy_jobs has no unique (id, sys_profile) index "
+            "(migrations/004, or the dbt model dropped it) — direct_ingest disabled for this run"
+        )
+        direct_ingest = False
 
-    for config in configs:
-        for title in config["titles"]:
-            for location in config["locations"]:
-                find_and_process(
-                    title=title,
-                    location=location,
-                    profile=config["profile"],
-                    searches=config["searches"],
-                )
+    if replay_from:
+        _replay_cached_scrapes(replay_from, run_name, direct_ingest)
+    else:
+        queries = plan_scrape_queries(configs, merge_subsumed=merge_subsumed)
+        requested = sum(len(c["titles"]) * len(c["locations"]) for c in configs)
+        print(f"Planned {len(queries)} unique queries from {requested} requested combos")
+        if adaptive_budget:
+            plan_scrape_budgets(queries)
+
+        options = {
+            "use_watermarks": use_watermarks,
+            "two_phase": two_phase,
+            "direct_ingest": direct_ingest,
+        }
+        if concurrent_scrape:
+            futures = [scrape_query.submit(query, **options) for query in queries]
+            results = (f.result() for f in as_completed(futures))
+        else:
+            results = (scrape_query(query, **options) for query in queries)
 
-    run_dbt()
+        remaining = {
+            c["profile"]: sum(c["profile"] in q["targets"] for q in queries) for c in configs
+        }
+        stats = []
+        # Profiles with a failed jobspy_jobs upsert wait for dbt to publish their rows
+        deferred = set()
+        for query_stats in results:
+            stats.append(query_stats)
+            if not direct_ingest:
+                continue
+            if any("upserted" in s and s["upserted"] is None for s in query_stats["sites"].values()):
+                deferred.update(query_stats["profiles"])
+            for profile in query_stats["profiles"]:
+                remaining[profile] -= 1
+                if remaining[profile] == 0 and profile in deferred:
+                    print(f"All queries for {profile} scraped — some upserts failed, pushing after dbt")
+                elif remaining[profile] == 0:
+                    print(f"All queries for {profile} scraped — pushing before dbt")
+                    # A failed push must not stop the other slices from reaching dbt
+                    try:
+                        _push_unevaluated(next(c for c in configs if c["profile"] == profile), run_name)
+                    except Exception as e:
+                        print(f"WARNING: early queue push for {profile} failed, pushing after dbt: {type(e).__name__}: {e}")
+                    else:
+                        pushed.add(profile)
+        _report_scrape_stats(stats)
+
+    if full_dbt:
+        run_dbt(select=None, full_refresh=True)
+    else:
+        run_dbt()
 
-    run_name = runtime.flow_run.name
     for config in configs:
-        profile = config["profile"]
-        resume, _ = load_resume(profile)
-        cap = len(config["titles"]) * len(config["locations"]) * config["searches"] * 2
-        jobs_df = load_jobs(profile, limit=cap)
-
-        if jobs_df.empty:
-            print(f"No unevaluated jobs for {profile}")
-            continue
-
-        _push_profile_to_queue(profile, resume, jobs_df, run_name)
+        if config["profile"] not in pushed:
+            _push_unevaluated(config, run_name)
 
 
 @flow()
@@ -544,11 +1755,74 @@ def notify_matches_flow(min_score: float = 6.9):
         if jobs:
             job_ids = [job[-1] for _, job in jobs]
             send_telegram_notifications(jobs, run_name, chat_id, profile, total_evaluated=len(written))
-            _mark_jobs_notified(job_ids)
+            _mark_jobs_notified(profile, job_ids)
         else:
             print(f"No qualifying jobs (>= {min_score}) for {profile} ({len(written)} evaluated)")
 
 
+@flow()
+def prune_import_jobs_flow(
+    retention_days: int = IMPORT_JOBS_RETENTION_DAYS,
+    archive: bool = True,
+    force: bool = False,
+):
+    """
+    Archive (or drop) jobspy.import_jobs partitions older than retention_days.
+
+    dbt builds public.jobspy_jobs from import_jobs, so pruning is refused
+    unless the jobspy_jobs model is incremental (per target/manifest.json);
+    a table model would lose every pruned row on its next build. Each pruned
+    partition is recorded in jobspy.import_jobs_pruned, and load_jobs_flow
+    then refuses full_dbt, whose --full-refresh would lose them too.
+
+    A partition is only removed once every row is deduped into
+    public.jobspy_jobs (same id and sys_profile); otherwise it is kept and
+    reported, unless force is set. Rows of those days still sitting in
+    import_jobs_default are first split into their own day partitions. With
+    archive (the default), partitions are detached and moved to the
+    jobspy_archive schema instead of dropped, so dbt no longer scans them
+    but the raw rows stay available.
+    """
+    materialized = _jobspy_jobs_config().get("materialized")
+    if materialized != "incremental":
+        raise RuntimeError(
+            f"jobspy_jobs model is materialized as {materialized or 'unknown (no manifest)'}; "
+            "dbt would drop every pruned row on its next build — make it incremental first"
+        )
+    cutoff = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+    split = _split_default_partition(cutoff)
+    if split:
+        print(f"Moved out-of-window rows from import_jobs_default into {split}")
+    pruned, kept = [], []
+    for partition in _import_jobs_partitions():
+        name = partition["name"]
+        if partition["upper"] is None or partition["upper"] > cutoff:
+            continue
+        missing = _undeduped_rows(name)
+        if missing and not force:
+            print(f"Keeping {name}: {missing} rows not in jobspy_jobs")
+            kept.append(name)
+            continue
+        with get_db_engine().begin() as conn:
+            if archive:
+                conn.execute(text(f'ALTER TABLE jobspy.import_jobs DETACH PARTITION jobspy."{name}"'))
+                conn.execute(text(f'ALTER TABLE jobspy."{name}" SET SCHEMA jobspy_archive'))
+            else:
+                conn.execute(text(f'DROP TABLE jobspy."{name}"'))
+            conn.execute(text("""
+                INSERT INTO jobspy.import_jobs_pruned (partition_name, upper_bound, archived)
+                VALUES (:name, :upper, :archived)
+                ON CONFLICT (partition_name) DO NOTHING
+            """), {"name": name, "upper": partition["upper"], "archived": archive})
+        print(f"{'Archived' if archive else 'Dropped'} {name}")
+        pruned.append(name)
+    print(
+        f"import_jobs retention ({retention_days}d, before {cutoff}): "
+        f"{len(pruned)} pruned, {len(kept)} kept"
+    )
+    return pruned
+
+
 # ---------------------------------------------------------------------------
 # Legacy single-shot flow (Claude direct, no queue) — kept for ad-hoc runs
 # ---------------------------------------------------------------------------
@@ -561,7 +1835,7 @@ def get_top_jobs(run_name: str, min_score: float = 7.5):
             e.avg_score, e.match_scores, e.reasoning,
             COALESCE(j.job_url_direct, j.job_url) as job_url
         FROM public.evaluated_jobs e
-        INNER JOIN public.jobspy_jobs j ON e.job_id = j.id
+        INNER JOIN public.jobspy_jobs j ON j.id = e.job_id AND j.sys_profile = e.sys_profile
         WHERE e.sys_run_name = :run_name AND e.avg_score >= :min_score
         ORDER BY e.avg_score DESC
     """)
@@ -609,6 +1883,7 @@ def get_jobs(
     min_score: float = 7.5,
 ):
     parent_run_name = runtime.flow_run.name
+    _ensure_import_jobs_partitions()
     for location in locations:
         find_and_process(title=title, location=location, profile=profile, searches=searches)
     run_dbt()
@@ -0,0 +1,23 @@
+-- Incremental scrape watermarks
+-- Last successful scrape per (site, title, location) so the next run only asks
+-- job boards for postings newer than that (plus a small overlap).
+-- title/location are stored normalized (lowercase, single spaces).
+-- profiles holds the query's target profiles at that scrape: a profile that
+-- joins the query later has never seen its backlog, so the watermark is
+-- ignored until it has been scraped for the new set once.
+--
+-- Run as user_job_searcher:
+--   docker exec hub_db psql -U user_job_searcher -d job_searcher -f this_file.sql
+
+CREATE TABLE IF NOT EXISTS jobspy.scrape_watermark (
+    site            text        NOT NULL,
+    title           text        NOT NULL,
+    location        text        NOT NULL,
+    last_scraped_at timestamptz NOT NULL,
+    profiles        text[]      NOT NULL DEFAULT '{}',
+    PRIMARY KEY (site, title, location)
+);
+
+-- Tables created before the profiles column
+ALTER TABLE jobspy.scrape_watermark
+    ADD COLUMN IF NOT EXISTS profiles text[] NOT NULL DEFAULT '{}';
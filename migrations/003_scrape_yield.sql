@@ -0,0 +1,56 @@
+-- Scrape yield history for adaptive results_wanted budgets
+-- One row per site scrape: how many rows were asked for, returned, and how
+-- many of those were not already in public.jobspy_jobs.
+-- title/location are stored normalized (lowercase, single spaces).
+--
+-- Run as user_job_searcher:
+--   docker exec hub_db psql -U user_job_searcher -d job_searcher -f this_file.sql
+
+CREATE TABLE IF NOT EXISTS jobspy.scrape_yield (
+    site           text        NOT NULL,
+    title          text        NOT NULL,
+    location       text        NOT NULL,
+    sys_run_name   text        NOT NULL,
+    results_wanted int         NOT NULL,
+    scraped_rows   int         NOT NULL,
+    new_unique     int         NOT NULL,
+    scraped_at     timestamptz NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS scrape_yield_combo_idx
+    ON jobspy.scrape_yield (site, title, location, scraped_at DESC);
+
+-- Per-combo yield over the last `days` days plus the most recent budget chosen.
+-- The one definition: main.load_yield_stats selects from it with
+-- SCRAPE_YIELD_DAYS, ad-hoc queries use SELECT * FROM jobspy.scrape_yield_stats().
+DROP VIEW IF EXISTS jobspy.scrape_yield_stats;
+
+CREATE OR REPLACE FUNCTION jobspy.scrape_yield_stats(days int DEFAULT 30)
+RETURNS TABLE (
+    site            text,
+    title           text,
+    location        text,
+    runs            bigint,
+    scraped_rows    bigint,
+    new_unique      bigint,
+    yield_rate      double precision,
+    last_budget     int,
+    last_scraped_at timestamptz
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        y.site,
+        y.title,
+        y.location,
+        COUNT(*)                                                       AS runs,
+        SUM(y.scraped_rows)                                            AS scraped_rows,
+        SUM(y.new_unique)                                              AS new_unique,
+        SUM(y.new_unique)::float / NULLIF(SUM(y.scraped_rows), 0)      AS yield_rate,
+        (ARRAY_AGG(y.results_wanted ORDER BY y.scraped_at DESC))[1]    AS last_budget,
+        MAX(y.scraped_at)                                              AS last_scraped_at
+    FROM jobspy.scrape_yield y
+    WHERE y.scraped_at >= NOW() - MAKE_INTERVAL(days => days)
+    GROUP BY y.site, y.title, y.location
+$$;
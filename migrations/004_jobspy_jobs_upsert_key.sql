@@ -0,0 +1,23 @@
+-- Natural key for direct ingest into public.jobspy_jobs
+-- load_jobs_flow(direct_ingest=true) upserts scraped rows straight into
+-- jobspy_jobs with ON CONFLICT (id, sys_profile), which needs this unique index.
+--
+-- jobspy_jobs is built by dbt (data__job_searcher). If the model is
+-- materialized as a table, every dbt build recreates it without this index,
+-- so the model must declare it itself:
+--
+--   {{ config(
+--       unique_key=['id', 'sys_profile'],
+--       indexes=[{'columns': ['id', 'sys_profile'], 'unique': True}]
+--   ) }}
+--
+-- load_jobs_flow only checks for the index (main._jobspy_jobs_has_index) and
+-- turns direct_ingest off when it is missing; it never creates it. This
+-- migration fails if jobspy_jobs already holds duplicate (id, sys_profile)
+-- rows; dedupe them first.
+--
+-- Run as user_job_searcher:
+--   docker exec hub_db psql -U user_job_searcher -d job_searcher -f this_file.sql
+
+CREATE UNIQUE INDEX IF NOT EXISTS jobspy_jobs_id_profile_key
+    ON public.jobspy_jobs (id, sys_profile);
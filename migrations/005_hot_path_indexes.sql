@@ -0,0 +1,36 @@
+-- Indexes for the pipeline's hot-path queries (see *_SQL constants in main.py)
+-- Checked by scripts/check_query_plans.py, which fails on a seq scan of
+-- jobspy_jobs / evaluated_jobs for these queries on a seeded dataset.
+--
+-- public.jobspy_jobs is built by dbt (data__job_searcher): a table rebuild
+-- drops the index below, and LOAD_JOBS_SQL falls back to a seq scan. The
+-- jobspy_jobs model must declare it next to the upsert key from 004:
+--
+--   {{ config(
+--       indexes=[
+--           {'columns': ['id', 'sys_profile'], 'unique': True},
+--           {'columns': ['sys_profile', 'date_posted', 'id']},
+--       ]
+--   ) }}
+--
+-- run_dbt warns after each build when either is missing (JOBSPY_JOBS_INDEXES
+-- in main.py). This migration only covers the table as it exists now; the
+-- evaluated_jobs indexes are not dbt-managed.
+--
+-- Run as user_job_searcher:
+--   python scripts/migrate.py
+
+-- LOAD_JOBS_SQL: candidates per profile by posting date
+CREATE INDEX IF NOT EXISTS jobspy_jobs_profile_posted_idx
+    ON public.jobspy_jobs (sys_profile, date_posted, id);
+
+-- LOAD_JOBS_SQL: NOT EXISTS anti-join on evaluated_jobs.job_id
+CREATE INDEX IF NOT EXISTS evaluated_jobs_job_id_idx
+    ON public.evaluated_jobs (job_id);
+
+-- TOP_JOBS_SQL: unsent, high-scoring, recent evaluations per profile.
+-- Partial on notified_at IS NULL so it only holds the rows still to be sent.
+-- (The jobspy_jobs side of the join uses jobspy_jobs_id_profile_key from 004.)
+CREATE INDEX IF NOT EXISTS evaluated_jobs_unnotified_idx
+    ON public.evaluated_jobs (sys_profile, avg_score DESC, created_at)
+    WHERE notified_at IS NULL;
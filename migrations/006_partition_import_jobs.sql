@@ -0,0 +1,133 @@
+-- Partition jobspy.import_jobs by scrape date
+-- Every nightly run appends raw rows (descriptions included) to import_jobs and
+-- nothing ever removed them. The table becomes RANGE-partitioned on a new
+-- sys_scraped_date column (one partition per day) so prune_import_jobs_flow
+-- can drop or archive whole days once they are deduped into jobspy_jobs.
+--
+-- The existing table is attached as-is as jobspy.import_jobs_legacy, covering
+-- everything before the day this runs — no rows are copied. Its rows get
+-- sys_scraped_date = the day before the migration; they are pruned as one
+-- block once that date falls out of the retention window.
+--
+-- Within a day, rows are found by sys_run_name (what dbt's incremental models
+-- filter on) through an index inherited by every partition.
+--
+-- dbt views selecting from import_jobs follow the renamed table until their
+-- next build (DBT_SELECT rebuilds them every run).
+--
+-- Run as user_job_searcher (owner of jobspy.import_jobs):
+--   python scripts/migrate.py
+
+CREATE SCHEMA IF NOT EXISTS jobspy_archive;
+
+DO $$
+DECLARE
+    cutover date := CURRENT_DATE;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'jobspy' AND c.relname = 'import_jobs' AND c.relkind = 'p'
+    ) THEN
+        RETURN;  -- already partitioned
+    END IF;
+
+    IF to_regclass('jobspy.import_jobs') IS NOT NULL THEN
+        ALTER TABLE jobspy.import_jobs RENAME TO import_jobs_legacy;
+        -- Constant default: metadata-only, existing rows are not rewritten
+        EXECUTE format(
+            'ALTER TABLE jobspy.import_jobs_legacy ADD COLUMN sys_scraped_date date NOT NULL DEFAULT %L',
+            cutover - 1
+        );
+        ALTER TABLE jobspy.import_jobs_legacy ALTER COLUMN sys_scraped_date DROP DEFAULT;
+        CREATE TABLE jobspy.import_jobs (LIKE jobspy.import_jobs_legacy INCLUDING DEFAULTS)
+            PARTITION BY RANGE (sys_scraped_date);
+        EXECUTE format(
+            'ALTER TABLE jobspy.import_jobs ATTACH PARTITION jobspy.import_jobs_legacy '
+            'FOR VALUES FROM (MINVALUE) TO (%L)',
+            cutover
+        );
+    ELSE
+        -- Fresh database: every column scrape_jobs returns (jobspy's
+        -- desired_order), typed as pandas.to_sql used to create them.
+        -- write_to_db COPYs into this table and skips columns it lacks.
+        CREATE TABLE jobspy.import_jobs (
+            id                    text,
+            site                  text,
+            job_url               text,
+            job_url_direct        text,
+            title                 text,
+            company               text,
+            location              text,
+            date_posted           date,
+            job_type              text,
+            salary_source         text,
+            interval              text,
+            min_amount            double precision,
+            max_amount            double precision,
+            currency              text,
+            is_remote             boolean,
+            job_level             text,
+            job_function          text,
+            listing_type          text,
+            emails                text,
+            description           text,
+            company_industry      text,
+            company_url           text,
+            company_logo          text,
+            company_url_direct    text,
+            company_addresses     text,
+            company_num_employees text,
+            company_revenue       text,
+            company_description   text,
+            skills                text,
+            experience_range      text,
+            company_rating        double precision,
+            company_reviews_count double precision,
+            vacancy_count         double precision,
+            work_from_home_type   text,
+            sys_profile           text,
+            sys_run_name          text,
+            sys_scraped_date      date NOT NULL
+        ) PARTITION BY RANGE (sys_scraped_date);
+    END IF;
+
+    ALTER TABLE jobspy.import_jobs ALTER COLUMN sys_scraped_date SET DEFAULT CURRENT_DATE;
+    CREATE TABLE jobspy.import_jobs_default PARTITION OF jobspy.import_jobs DEFAULT;
+    CREATE INDEX import_jobs_run_name_idx ON jobspy.import_jobs (sys_run_name);
+END $$;
+
+-- Partitions prune_import_jobs_flow has dropped or archived. jobspy_jobs is
+-- built from import_jobs, so a dbt --full-refresh after a prune would lose
+-- these rows; load_jobs_flow(full_dbt=true) refuses while any are listed.
+CREATE TABLE IF NOT EXISTS jobspy.import_jobs_pruned (
+    partition_name text PRIMARY KEY,
+    upper_bound    date NOT NULL,
+    archived       boolean NOT NULL,
+    pruned_at      timestamptz NOT NULL DEFAULT NOW()
+);
+
+-- Create the partition for day d if missing. Rows that already landed in the
+-- default partition for d are moved into it first, so this is always safe to
+-- call; load_jobs_flow calls it for today and tomorrow before scraping.
+CREATE OR REPLACE FUNCTION jobspy.ensure_import_jobs_partition(d date)
+RETURNS text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    part text := 'import_jobs_p' || to_char(d, 'YYYYMMDD');
+BEGIN
+    IF to_regclass('jobspy.' || part) IS NOT NULL THEN
+        RETURN part;
+    END IF;
+    EXECUTE format('CREATE TABLE jobspy.%I (LIKE jobspy.import_jobs INCLUDING DEFAULTS)', part);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM jobspy.import_jobs_default WHERE sys_scraped_date = %L RETURNING *) '
+        'INSERT INTO jobspy.%I SELECT * FROM moved',
+        d, part
+    );
+    EXECUTE format(
+        'ALTER TABLE jobspy.import_jobs ATTACH PARTITION jobspy.%I FOR VALUES FROM (%L) TO (%L)',
+        part, d, d + 1
+    );
+    RETURN part;
+END $$;
@@ -0,0 +1,31 @@
+-- Per-profile blocklist rules on company, title and description
+-- Applied by load_jobs (blocklist.BlocklistRules) before jobs are queued for
+-- the LLM. adm.job_search_config.blocklist keeps working and is read as fuzzy
+-- title rules with threshold 85.
+--
+--   keyword  whole-word, case-insensitive match in any field
+--            ('Robert Half' on company, 'clearance required' on description)
+--   fuzzy    title only: fuzz.partial_ratio(title, pattern) >= threshold
+--
+-- NOTE: adm schema is owned by hub_user, not user_job_searcher.
+-- As hub_user:
+--   docker exec hub_db psql -U hub_user -d job_searcher -f this_file.sql
+-- then mark it applied: python scripts/migrate.py --baseline 007
+
+CREATE TABLE IF NOT EXISTS adm.blocklist_rules (
+    id         bigserial   PRIMARY KEY,
+    profile    text        NOT NULL,
+    field      text        NOT NULL CHECK (field IN ('company', 'title', 'description')),
+    match_type text        NOT NULL CHECK (match_type IN ('keyword', 'fuzzy')),
+    pattern    text        NOT NULL,
+    threshold  int         CHECK (threshold BETWEEN 0 AND 100),
+    is_active  boolean     NOT NULL DEFAULT TRUE,
+    created_at timestamptz NOT NULL DEFAULT NOW(),
+    CHECK (match_type = 'keyword' OR field = 'title')
+);
+
+CREATE INDEX IF NOT EXISTS blocklist_rules_profile_idx
+    ON adm.blocklist_rules (profile) WHERE is_active;
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON adm.blocklist_rules TO user_job_searcher;
+GRANT USAGE ON SEQUENCE adm.blocklist_rules_id_seq TO user_job_searcher;
@@ -0,0 +1,14 @@
+-- Profile-scoped lookups on evaluated_jobs
+-- load_jobs excludes jobs already evaluated for the same profile (not for any
+-- profile), and _drain_queue_results / _mark_jobs_notified look jobs up by
+-- (sys_profile, job_id). This index serves all three as index(-only) probes,
+-- however many profiles' rows the table holds; it supersedes the job_id-only
+-- index from 005.
+--
+-- Run as user_job_searcher:
+--   python scripts/migrate.py
+
+CREATE INDEX IF NOT EXISTS evaluated_jobs_profile_job_idx
+    ON public.evaluated_jobs (sys_profile, job_id);
+
+DROP INDEX IF EXISTS public.evaluated_jobs_job_id_idx;
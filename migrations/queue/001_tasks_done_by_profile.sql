@@ -0,0 +1,8 @@
+-- Queue DB (LLM_QUEUE_DSN) index for _drain_queue_results (DONE_TASKS_SQL in main.py)
+-- Expression index on the payload's sys_profile, partial on finished tasks.
+--
+--   python scripts/migrate.py --queue
+
+CREATE INDEX IF NOT EXISTS tasks_done_profile_idx
+    ON llm_queue.tasks (topic, (payload->>'sys_profile'))
+    WHERE status = 'done';
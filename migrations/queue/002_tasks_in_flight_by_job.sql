@@ -0,0 +1,11 @@
+-- Queue DB (LLM_QUEUE_DSN) index for _in_flight_job_ids (IN_FLIGHT_SQL in main.py)
+-- Lets the push stage look up pending/processing extract and eval tasks by
+-- (sys_profile, job_id) so re-runs don't queue the same job twice.
+-- Partial: only unfinished tasks of the two job topics are indexed.
+--
+--   python scripts/migrate.py --queue
+
+CREATE INDEX IF NOT EXISTS tasks_in_flight_job_idx
+    ON llm_queue.tasks ((payload->>'sys_profile'), (payload->>'job_id'))
+    WHERE topic IN ('job_extract', 'job_eval')
+      AND status IN ('pending', 'processing');
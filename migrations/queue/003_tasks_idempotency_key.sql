@@ -0,0 +1,18 @@
+-- Queue DB (LLM_QUEUE_DSN): idempotency keys for LLMQueueClient.push_batch
+-- A key (llm_queue.idempotency_key(job_id, sys_profile, prompt, resume)) may
+-- be held by at most one live task. Failed and cancelled tasks release their
+-- key so the work can be pushed again; pending, processing and done keep it.
+-- The client inserts with
+--   ON CONFLICT (idempotency_key)
+--     WHERE idempotency_key IS NOT NULL AND status NOT IN ('failed', 'cancelled')
+--   DO NOTHING
+-- so the index predicate below must stay in sync with _LIVE_KEY in client.py.
+--
+--   python scripts/migrate.py --queue
+
+ALTER TABLE llm_queue.tasks
+    ADD COLUMN IF NOT EXISTS idempotency_key text;
+
+CREATE UNIQUE INDEX IF NOT EXISTS tasks_idempotency_key_key
+    ON llm_queue.tasks (idempotency_key)
+    WHERE idempotency_key IS NOT NULL AND status NOT IN ('failed', 'cancelled');
@@ -0,0 +1,16 @@
+-- Queue DB (LLM_QUEUE_DSN): content-addressed payload blobs
+-- With LLM_QUEUE_BLOBS=true, LLMQueueClient stores payload strings >= 1 KiB
+-- (eval prompt, resume, description) here once, keyed by SHA-256 of the text,
+-- and tasks carry {"$blob": "<hash>"} instead. encoding is 'identity' or
+-- 'zstd' (when the client has zstandard installed).
+-- The worker must resolve references before enabling LLM_QUEUE_BLOBS.
+--
+--   python scripts/migrate.py --queue
+
+CREATE TABLE IF NOT EXISTS llm_queue.blobs (
+    hash       text        PRIMARY KEY,
+    encoding   text        NOT NULL DEFAULT 'identity' CHECK (encoding IN ('identity', 'zstd')),
+    data       bytea       NOT NULL,
+    size       int         NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT NOW()
+);
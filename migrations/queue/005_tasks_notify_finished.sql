@@ -0,0 +1,27 @@
+-- Queue DB (LLM_QUEUE_DSN): completion notifications for LLMQueueClient waits
+-- Whenever a task's status changes to done, failed or cancelled, the task id is
+-- sent on channel llm_queue_done (payload: the id as text). wait_for_result
+-- and wait_for_batch LISTEN on it and wake as soon as their tasks finish,
+-- instead of sleep-polling llm_queue.tasks. Notifications are delivered on
+-- commit, and only to sessions already listening; clients re-check the table
+-- whenever they (re)start listening.
+-- The channel name must stay in sync with DONE_CHANNEL in client.py.
+--
+--   python scripts/migrate.py --queue
+
+CREATE OR REPLACE FUNCTION llm_queue.notify_task_finished()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('llm_queue_done', NEW.id::text);
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS tasks_notify_finished ON llm_queue.tasks;
+
+CREATE TRIGGER tasks_notify_finished
+    AFTER UPDATE OF status ON llm_queue.tasks
+    FOR EACH ROW
+    WHEN (NEW.status IN ('done', 'failed', 'cancelled') AND OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION llm_queue.notify_task_finished();
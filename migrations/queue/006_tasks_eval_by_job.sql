@@ -0,0 +1,11 @@
+-- Queue DB (LLM_QUEUE_DSN) index for _release_failed_eval_keys (RELEASE_FAILED_EVAL_KEYS_SQL in main.py)
+-- A job_extract task that finished keeps its idempotency key (003) even when
+-- the job_eval it spawned fails, so the job would be skipped as "already
+-- queued" forever. Before pushing, main.py frees such keys; that looks up
+-- each done extract's job_eval tasks by (sys_profile, job_id), in any status.
+--
+--   python scripts/migrate.py --queue
+
+CREATE INDEX IF NOT EXISTS tasks_eval_job_idx
+    ON llm_queue.tasks ((payload->>'sys_profile'), (payload->>'job_id'))
+    WHERE topic = 'job_eval';
@@ -0,0 +1,55 @@
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Root of the on-disk scrape cache: <dir>/<run_name>/<site>__<title>__<location>__<utc ts>.parquet
+SCRAPE_CACHE_DIR = Path(os.getenv("SCRAPE_CACHE_DIR", "scrape_cache"))
+SCRAPE_CACHE_ENABLED = os.getenv("SCRAPE_CACHE", "true").lower() == "true"
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-")
+
+
+def save_scrape(
+    jobs: pd.DataFrame, run_name: str, site: str, query: dict, scraped_at: datetime
+) -> Path | None:
+    """Persist one site's rows (already fanned out per sys_profile) as parquet, before they are stored.
+
+    Best effort — a cache write failure never fails the scrape.
+    """
+    if not SCRAPE_CACHE_ENABLED or jobs.empty:
+        return None
+    run_dir = SCRAPE_CACHE_DIR / _slug(run_name)
+    path = run_dir / f"{site}__{_slug(query['title'])}__{_slug(query['location'])}__{scraped_at:%Y%m%dT%H%M%S}.parquet"
+    try:
+        run_dir.mkdir(parents=True, exist_ok=True)
+        jobs.drop(columns=["sys_run_name"], errors="ignore").to_parquet(path, index=False)
+    except Exception as e:
+        print(f"WARNING: could not cache {site} scrape to {path}: {type(e).__name__}: {e}")
+        return None
+    return path
+
+
+def cached_runs() -> list[str]:
+    """Run names with at least one cached scrape, oldest first."""
+    if not SCRAPE_CACHE_DIR.is_dir():
+        return []
+    runs = [p for p in SCRAPE_CACHE_DIR.iterdir() if p.is_dir() and any(p.glob("*.parquet"))]
+    return [p.name for p in sorted(runs, key=lambda p: p.stat().st_mtime)]
+
+
+def load_cached_run(run_name: str) -> list[tuple[str, pd.DataFrame]]:
+    """All cached frames of a run as (file stem, rows), in scrape order."""
+    run_dir = SCRAPE_CACHE_DIR / _slug(run_name)
+    files = sorted(run_dir.glob("*.parquet"), key=lambda p: p.name.rsplit("__", 1)[-1])
+    if not files:
+        runs = cached_runs()
+        raise FileNotFoundError(
+            f"No cached scrapes for run {run_name!r} in {run_dir}. "
+            f"Cached runs: {', '.join(runs[-10:]) if runs else 'none'}"
+        )
+    return [(path.stem, pd.read_parquet(path)) for path in files]
@@ -0,0 +1,201 @@
+import re
+
+import pandas as pd
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def _tokens(title: str) -> frozenset[str]:
+    return frozenset(re.findall(r"[a-z0-9+#]+", str(title).lower()))
+
+
+def _find_root(title: str, titles: list[str]) -> str:
+    """Broadest title in `titles` whose tokens are a strict subset of `title`'s.
+
+    "business analyst" is the root of "senior business analyst". Returns
+    `title` itself when nothing broader was requested at the same location.
+    """
+    own = _tokens(title)
+    ancestors = [t for t in titles if _tokens(t) < own]
+    if not ancestors:
+        return title
+    return min(ancestors, key=lambda t: (len(_tokens(t)), t))
+
+
+def plan_scrape_queries(configs: list[dict], merge_subsumed: bool = False) -> list[dict]:
+    """Collapse every profile's titles × locations into one global set of queries.
+
+    Identical (title, location) pairs — case and whitespace insensitive — are
+    scraped once with the largest `searches` any profile asked for. With
+    merge_subsumed, a title whose tokens contain a broader requested title at
+    the same location ("senior business analyst" ⊃ "business analyst") is
+    folded into the broader query as well. That is off by default: a broad
+    search capped at N results does not contain the narrow search's top N.
+
+    Each query is a dict:
+        {"title", "location", "searches",
+         "targets": {profile: [requested titles, normalized]}}
+    """
+    grouped: dict[tuple[str, str], dict] = {}
+    for config in configs:
+        for title in config["titles"]:
+            for location in config["locations"]:
+                key = (_normalize(location), _normalize(title))
+                query = grouped.setdefault(key, {
+                    "title": title,
+                    "location": location,
+                    "searches": 0,
+                    "targets": {},
+                })
+                query["searches"] = max(query["searches"], config["searches"])
+                requested = query["targets"].setdefault(config["profile"], [])
+                if key[1] not in requested:
+                    requested.append(key[1])
+
+    if not merge_subsumed:
+        return list(grouped.values())
+
+    by_location: dict[str, list[str]] = {}
+    for loc, title in grouped:
+        by_location.setdefault(loc, []).append(title)
+
+    merged: dict[tuple[str, str], dict] = {}
+    for (loc, title), query in grouped.items():
+        root = _find_root(title, by_location[loc])
+        if root != title:
+            print(f"Planner: '{title}' in {query['location']} subsumed by '{root}'")
+        target = merged.setdefault((loc, root), {
+            **grouped[(loc, root)],
+            "searches": 0,
+            "targets": {},
+        })
+        target["searches"] = max(target["searches"], query["searches"])
+        for profile, requested in query["targets"].items():
+            titles = target["targets"].setdefault(profile, [])
+            titles.extend(t for t in requested if t not in titles)
+    return list(merged.values())
+
+
+def query_key(query: dict) -> tuple[str, str]:
+    """Normalized (title, location) identifying a query across runs."""
+    return _normalize(query["title"]), _normalize(query["location"])
+
+
+def single_profile_query(title: str, location: str, profile: str, searches: int) -> dict:
+    """Query dict for one profile's title × location, bypassing the planner."""
+    return {
+        "title": title,
+        "location": location,
+        "searches": searches,
+        "targets": {profile: [_normalize(title)]},
+    }
+
+
+def fan_out_rows(jobs: pd.DataFrame, query: dict) -> pd.DataFrame:
+    """Copy scraped rows to every profile interested in the query.
+
+    A profile that requested the query's own title gets every row. A profile
+    that only requested narrower titles (via merge_subsumed) gets the rows
+    whose job title contains all tokens of one of its requested titles.
+    """
+    query_title = _normalize(query["title"])
+    row_tokens = jobs["title"].map(_tokens) if "title" in jobs else None
+    frames = []
+    for profile, requested in query["targets"].items():
+        if query_title in requested or row_tokens is None:
+            subset = jobs
+        else:
+            wanted = [_tokens(t) for t in requested]
+            subset = jobs[row_tokens.map(lambda toks: any(w <= toks for w in wanted))]
+        frames.append(subset.assign(sys_profile=profile))
+    if not frames:
+        return jobs.iloc[0:0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _water_fill(weights: dict, total: float, floor: int, cap: int) -> dict:
+    """Split `total` proportionally to weights, each share clamped to [floor, cap].
+
+    Shares that fall outside the bounds are pinned to the bound and the rest
+    of the total is re-split among the others, so unclamped shares stay
+    exactly proportional to their weights. Shares are rounded by largest
+    remainder, so they add up to `total` whenever the bounds allow it.
+    """
+    pinned: dict = {}
+    while True:
+        open_keys = [k for k in weights if k not in pinned]
+        left = total - sum(pinned.values())
+        wsum = sum(weights[k] for k in open_keys)
+        shares = {
+            k: left * (weights[k] / wsum if wsum > 0 else 1 / len(open_keys))
+            for k in open_keys
+        }
+        over = {k: cap for k, b in shares.items() if b > cap}
+        under = {k: floor for k, b in shares.items() if b < floor}
+        # Pin the side that is further out of bounds first; the other may resolve itself
+        if over and (not under or sum(shares[k] - cap for k in over) >= sum(floor - shares[k] for k in under)):
+            pinned.update(over)
+        elif under:
+            pinned.update(under)
+        else:
+            budgets = {**pinned, **{k: int(b) for k, b in shares.items()}}
+            leftover = int(round(total - sum(budgets.values())))
+            for k in sorted(shares, key=lambda k: shares[k] - int(shares[k]), reverse=True)[:max(leftover, 0)]:
+                budgets[k] += 1
+            return budgets
+
+
+def allocate_budgets(
+    queries: list[dict],
+    sites: list[str],
+    yield_history: dict[tuple[str, str, str], tuple[int, int]],
+    total: int | None = None,
+    floor: int = 5,
+    cap: int = 150,
+    prior_rows: int = 50,
+) -> list[dict]:
+    """Reallocate results_wanted across (site, query) pairs by past yield.
+
+    yield_history maps (site, title, location) — normalized as query_key —
+    to (scraped_rows, new_unique) summed over recent runs. Each pair's weight
+    is its configured `searches` scaled by its yield relative to the global
+    rate. The yield rate is smoothed towards the global rate with `prior_rows`
+    pseudo-rows, so a pair with no or little history keeps (close to) its
+    configured share instead of the average one. The total defaults to what
+    the fixed per-query `searches` would spend, so with no history every pair
+    gets its `searches` back (within floor/cap).
+
+    Sets query["budgets"] = {site: results_wanted} and returns one row per
+    pair for inspection.
+    """
+    if total is None:
+        total = sum(q["searches"] for q in queries) * len(sites)
+    seen_rows = sum(r for r, _ in yield_history.values())
+    seen_new = sum(n for _, n in yield_history.values())
+    global_rate = seen_new / seen_rows if seen_rows else 1.0
+
+    rows = {}
+    for i, query in enumerate(queries):
+        title, location = query_key(query)
+        for site in sites:
+            scraped, new = yield_history.get((site, title, location), (0, 0))
+            rate = (new + prior_rows * global_rate) / (scraped + prior_rows)
+            lift = rate / global_rate if global_rate > 0 else 1.0
+            rows[(i, site)] = {
+                "site": site,
+                "title": title,
+                "location": location,
+                "scraped_rows": scraped,
+                "new_unique": new,
+                "yield_rate": round(rate, 4),
+                "configured": query["searches"],
+                "weight": round(query["searches"] * lift, 2),
+            }
+
+    budgets = _water_fill({k: r["weight"] for k, r in rows.items()}, total, floor, cap)
+    for (i, site), budget in budgets.items():
+        rows[(i, site)]["budget"] = budget
+        queries[i].setdefault("budgets", {})[site] = budget
+    return list(rows.values())
@@ -0,0 +1,74 @@
+"""
+Benchmark the title blocklist: per-row fuzz.partial_ratio via DataFrame.apply
+(the old load_jobs path) vs blocklist.TitleBlocklist (one cdist matrix,
+all cores), cold and with memoized verdicts. Checks both give the same mask.
+No database needed.
+
+Usage: python scripts/bench_blocklist.py [titles] [terms]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
+
+from blocklist import TitleBlocklist
+
+TITLES = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+TERMS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+ROLES = ["analyst", "engineer", "consultant", "manager", "developer", "architect", "specialist"]
+LEVELS = ["", "senior ", "junior ", "lead ", "principal ", "staff "]
+
+
+def _word() -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=random.randint(4, 9)))
+
+
+def _old_is_blocked(title: str, blocklist: list[str], threshold: int = 85) -> bool:
+    title_lower = title.lower()
+    return any(
+        fuzz.partial_ratio(title_lower, term.lower()) >= threshold
+        for term in blocklist
+    )
+
+
+def main():
+    random.seed(7)
+    domains = [_word() for _ in range(300)]
+    titles = pd.Series([
+        f"{random.choice(LEVELS)}{random.choice(domains)} {random.choice(ROLES)}".title()
+        for _ in range(TITLES)
+    ])
+    # ~10% of terms target real title shapes, the rest never match — like a real blocklist
+    terms = [f"{random.choice(domains)} {random.choice(ROLES)}" for _ in range(TERMS // 10)]
+    terms += [_word() + " " + _word() for _ in range(TERMS - len(terms))]
+    print(f"{TITLES} titles ({titles.nunique()} unique) × {len(terms)} terms, {os.cpu_count()} cores")
+
+    started = time.perf_counter()
+    old = titles.apply(lambda t: _old_is_blocked(str(t), terms)).to_numpy()
+    old_s = time.perf_counter() - started
+
+    blocklist = TitleBlocklist(terms)
+    started = time.perf_counter()
+    cold = blocklist.blocked(titles)
+    cold_s = time.perf_counter() - started
+    started = time.perf_counter()
+    warm = blocklist.blocked(titles)
+    warm_s = time.perf_counter() - started
+
+    assert np.array_equal(old, cold) and np.array_equal(old, warm), "verdicts differ"
+    print(f"blocked {old.sum()} / {TITLES}")
+    print(f"  apply + partial_ratio   {old_s:8.3f}s")
+    print(f"  TitleBlocklist (cold)   {cold_s:8.3f}s  ({old_s / cold_s:.0f}x)")
+    print(f"  TitleBlocklist (memo)   {warm_s:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
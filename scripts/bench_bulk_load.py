@@ -0,0 +1,87 @@
+"""
+Benchmark write_to_db paths: DataFrame.to_sql(method="multi") vs COPY FROM STDIN.
+Loads a synthetic description-heavy frame into a scratch copy of jobspy.import_jobs.
+
+Usage: python scripts/bench_bulk_load.py [rows] [description_chars]
+"""
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import pandas as pd
+from sqlalchemy import text
+
+from bulk_load import copy_dataframe
+from main import get_db_engine
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+DESC_CHARS = int(sys.argv[2]) if len(sys.argv) > 2 else 4_000
+SCHEMA = "jobspy"
+TABLE = "bench_import_jobs"
+
+
+def synthetic_jobs(n: int) -> pd.DataFrame:
+    words = ["".join(random.choices(string.ascii_lowercase, k=random.randint(3, 10))) for _ in range(2000)]
+
+    def description() -> str:
+        out, size = [], 0
+        while size < DESC_CHARS:
+            w = random.choice(words)
+            out.append(w)
+            size += len(w) + 1
+        return " ".join(out)
+
+    return pd.DataFrame({
+        "id": [f"li-{i}" for i in range(n)],
+        "site": random.choices(["indeed", "linkedin", "google"], k=n),
+        "title": [f"Senior {random.choice(words).title()} Analyst" for _ in range(n)],
+        "company": [random.choice(words).title() for _ in range(n)],
+        "location": random.choices(["Toronto, ON", "New York, NY", "Dallas, TX"], k=n),
+        "date_posted": pd.Timestamp.today().normalize(),
+        "min_amount": [random.choice([None, 80000.0, 120000.0]) for _ in range(n)],
+        "job_url": [f"https://www.linkedin.com/jobs/view/{i}" for i in range(n)],
+        "description": [description() for _ in range(n)],
+        "sys_run_name": "bench",
+        "sys_profile": "Bench",
+    })
+
+
+def timed(label: str, fn) -> None:
+    engine = get_db_engine()
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {SCHEMA}.{TABLE}"))
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {elapsed:7.2f}s  {ROWS / elapsed:9.0f} rows/s  peak {peak / 2**20:7.1f} MiB")
+
+
+def main():
+    df = synthetic_jobs(ROWS)
+    engine = get_db_engine()
+    print(f"{ROWS} rows, ~{DESC_CHARS} char descriptions, {df.memory_usage(deep=True).sum() / 2**20:.0f} MiB frame")
+
+    df.head(0).to_sql(TABLE, engine, schema=SCHEMA, if_exists="replace", index=False)
+    try:
+        timed("to_sql(method=multi)", lambda: df.to_sql(
+            TABLE, engine, schema=SCHEMA, if_exists="append", index=False, method="multi",
+        ))
+        timed("COPY FROM STDIN", lambda: copy_dataframe(engine, df, SCHEMA, TABLE))
+        with engine.connect() as conn:
+            loaded = conn.execute(text(f"SELECT COUNT(*) FROM {SCHEMA}.{TABLE}")).scalar()
+        print(f"  COPY loaded {loaded} rows")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {SCHEMA}.{TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark one wait_for_batch poll: the old get_result-per-pending-id loop vs
+one get_results query. Inserts outstanding tasks under a scratch topic on
+LLM_QUEUE_DSN (a slice of them already done), times a few polls of each and
+deletes the tasks afterwards.
+
+Usage: python scripts/bench_queue_poll.py [tasks] [done_pct] [polls]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "vendor", "llm-queue-client"))
+
+from llm_queue import LLMQueueClient
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000
+DONE_PCT = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+POLLS = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+TOPIC = "bench_poll"
+
+
+def loop_poll(client: LLMQueueClient, ids: list[int]) -> dict:
+    """wait_for_batch before batching: one SELECT per pending id."""
+    finished = {}
+    for tid in ids:
+        result = client.get_result(tid)
+        if result is not None:
+            finished[tid] = result
+    return finished
+
+
+def main():
+    with LLMQueueClient(dsn=os.environ["LLM_QUEUE_DSN"]) as client:
+        try:
+            ids = client.push_batch(TOPIC, [{"job_id": f"li-{i}"} for i in range(TASKS)])
+            done = ids[: TASKS * DONE_PCT // 100]
+            with client._get_conn().cursor() as cur:
+                cur.execute(
+                    "UPDATE llm_queue.tasks SET status = 'done', result = '{\"verdict\": \"Lateral\"}' "
+                    "WHERE id = ANY(%s)",
+                    (done,),
+                )
+            print(f"{TASKS} outstanding ids, {len(done)} done, {POLLS} polls each")
+
+            for label, poll, statements in [
+                ("get_result per id", loop_poll, TASKS),
+                ("get_results", lambda c, i: c.get_results(i), 1),
+            ]:
+                started = time.perf_counter()
+                for _ in range(POLLS):
+                    finished = poll(client, ids)
+                per_poll = (time.perf_counter() - started) / POLLS
+                assert len(finished) == len(done)
+                print(f"  {label:<18} {per_poll * 1000:9.1f} ms/poll  {statements:5d} statements/poll")
+        finally:
+            with client._get_conn().cursor() as cur:
+                cur.execute("DELETE FROM llm_queue.tasks WHERE topic = %s", (TOPIC,))
+
+
+if __name__ == "__main__":
+    main()
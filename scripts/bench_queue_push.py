@@ -0,0 +1,84 @@
+"""
+Benchmark LLMQueueClient.push_batch: the old one-INSERT-per-payload loop vs
+the chunked multi-row INSERT. Pushes job_extract-shaped payloads (description,
+eval prompt, resume) under a scratch topic on LLM_QUEUE_DSN and deletes them
+afterwards.
+
+Usage: python scripts/bench_queue_push.py [payloads] [description_chars]
+"""
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "vendor", "llm-queue-client"))
+
+import psycopg2.extras
+from llm_queue import LLMQueueClient
+from llm_queue import client as queue_client
+
+PAYLOADS = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+DESC_CHARS = int(sys.argv[2]) if len(sys.argv) > 2 else 4_000
+TOPIC = "bench_push"
+
+
+def _text(chars: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase + "     ", k=chars))
+
+
+def synthetic_payloads(n: int) -> list[dict]:
+    prompt, resume = _text(6_000), _text(3_000)
+    return [
+        {
+            "job_id": f"li-{i}",
+            "company": "Acme",
+            "title": "Senior Business Analyst",
+            "sys_profile": "Bench",
+            "sys_run_name": "bench",
+            "inputs": {"description": _text(DESC_CHARS)},
+            "next_step": {"topic": "job_eval", "prompt": prompt, "inputs": {"candidate_json": resume}},
+        }
+        for i in range(n)
+    ]
+
+
+def loop_push(client: LLMQueueClient, payloads: list[dict]) -> list[int]:
+    """push_batch before batching: one INSERT ... RETURNING round trip per payload."""
+    ids = []
+    with client._get_conn().cursor() as cur:
+        for payload in payloads:
+            cur.execute(
+                "INSERT INTO llm_queue.tasks (topic, payload, priority) VALUES (%s, %s, %s) RETURNING id",
+                (TOPIC, psycopg2.extras.Json(payload), 0),
+            )
+            ids.append(cur.fetchone()[0])
+    return ids
+
+
+def main():
+    payloads = synthetic_payloads(PAYLOADS)
+    encoded = [json.dumps(p) for p in payloads]
+    chunks = len(list(queue_client._chunks(list(range(len(payloads))), [len(e.encode()) for e in encoded])))
+    total_mib = sum(len(e) for e in encoded) / 2**20
+    print(f"{PAYLOADS} payloads, {total_mib:.1f} MiB JSON")
+
+    with LLMQueueClient(dsn=os.environ["LLM_QUEUE_DSN"]) as client:
+        try:
+            for label, push, statements in [
+                ("INSERT per payload", loop_push, PAYLOADS),
+                ("push_batch", lambda c, p: c.push_batch(TOPIC, p), chunks),
+            ]:
+                started = time.perf_counter()
+                ids = push(client, payloads)
+                elapsed = time.perf_counter() - started
+                assert len(ids) == PAYLOADS and ids == sorted(ids)
+                print(f"  {label:<20} {elapsed:7.3f}s  {statements:5d} statements")
+        finally:
+            with client._get_conn().cursor() as cur:
+                cur.execute("DELETE FROM llm_queue.tasks WHERE topic = %s", (TOPIC,))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+EXPLAIN the pipeline's hot-path queries on a seeded dataset and fail on seq scans.
+
+Seeds synthetic rows into public.jobspy_jobs, public.evaluated_jobs and
+llm_queue.tasks inside a transaction, ANALYZEs, EXPLAINs LOAD_JOBS_SQL,
+TOP_JOBS_SQL, DONE_TASKS_SQL, IN_FLIGHT_SQL and RELEASE_FAILED_EVAL_KEYS_SQL
+from main.py, then rolls everything back.
+Exits 1 if any plan reads one of those tables with a Seq Scan.
+Point it at a staging database — seeding takes row locks for its duration.
+
+Usage: python scripts/check_query_plans.py [profiles] [jobs_per_profile]
+"""
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import text
+
+from main import (
+    DONE_TASKS_SQL,
+    IN_FLIGHT_SQL,
+    LOAD_JOBS_SQL,
+    RELEASE_FAILED_EVAL_KEYS_SQL,
+    TOP_JOBS_SQL,
+    get_db_engine,
+    get_queue_engine,
+)
+
+PROFILES = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+JOBS_PER_PROFILE = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+HOT_TABLES = {"jobspy_jobs", "evaluated_jobs", "tasks"}
+PROFILE = "__plan_check_0"
+
+SEED_JOBS = """
+    INSERT INTO public.jobspy_jobs (id, sys_profile, title, company, description, date_posted, location, job_url)
+    SELECT 'plan-' || p || '-' || n, '__plan_check_' || p, 'Analyst ' || n, 'Co ' || (n % 97),
+           repeat('x', 200), CURRENT_DATE - (n % 60), 'Toronto, ON', 'https://example.com/' || p || '/' || n
+    FROM generate_series(0, :profiles - 1) p, generate_series(1, :per_profile) n
+"""
+
+SEED_EVALUATED = """
+    INSERT INTO public.evaluated_jobs (job_id, avg_score, match_scores, reasoning, sys_run_name, sys_profile, created_at, notified_at)
+    SELECT 'plan-' || p || '-' || n, (n % 10)::float, '{}', '{}', 'plan-check', '__plan_check_' || p,
+           NOW() - make_interval(hours => n % 240),
+           CASE WHEN n % 20 = 0 THEN NULL ELSE NOW() END
+    FROM generate_series(0, :profiles - 1) p, generate_series(1, :per_profile) n
+    WHERE n % 3 <> 0
+"""
+
+SEED_TASKS = """
+    INSERT INTO llm_queue.tasks (topic, payload, status, idempotency_key)
+    SELECT CASE WHEN n % 2 = 0 THEN 'job_eval' ELSE 'job_extract' END,
+           jsonb_build_object('job_id', 'plan-' || p || '-' || n, 'sys_profile', '__plan_check_' || p),
+           CASE WHEN n % 5 = 0 THEN 'pending' WHEN n % 7 = 0 THEN 'failed' ELSE 'done' END,
+           CASE WHEN n % 2 = 1 THEN 'plan-key-' || p || '-' || n END
+    FROM generate_series(0, :profiles - 1) p, generate_series(1, :per_profile) n
+"""
+
+CHECKS = [
+    ("LOAD_JOBS_SQL", "db", LOAD_JOBS_SQL, {"profile": PROFILE, "limit": 600, "hours": 72}),
+    ("TOP_JOBS_SQL", "db", TOP_JOBS_SQL, {
+        "profile": PROFILE, "min_score": 6.9, "since": datetime.utcnow() - timedelta(hours=48),
+    }),
+    ("DONE_TASKS_SQL", "queue", DONE_TASKS_SQL, {"topic": "job_eval", "profile": PROFILE}),
+    ("IN_FLIGHT_SQL", "queue", IN_FLIGHT_SQL, {
+        "profile": PROFILE, "job_ids": [f"plan-0-{n}" for n in range(1, 201)],
+    }),
+    ("RELEASE_FAILED_EVAL_KEYS_SQL", "queue", RELEASE_FAILED_EVAL_KEYS_SQL, {
+        "keys": [f"plan-key-0-{n}" for n in range(1, 401, 2)],
+    }),
+]
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def _explain(conn, sql: str, params: dict) -> dict:
+    rows = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar()
+    return (json.loads(rows) if isinstance(rows, str) else rows)[0]["Plan"]
+
+
+def main():
+    seed = {"profiles": PROFILES, "per_profile": JOBS_PER_PROFILE}
+    db_conn = get_db_engine().connect()
+    queue_conn = get_queue_engine().connect()
+    failed = False
+    try:
+        print(f"Seeding {PROFILES} profiles × {JOBS_PER_PROFILE} jobs (rolled back afterwards) ...")
+        db_conn.execute(text(SEED_JOBS), seed)
+        db_conn.execute(text(SEED_EVALUATED), seed)
+        db_conn.execute(text("ANALYZE public.jobspy_jobs"))
+        db_conn.execute(text("ANALYZE public.evaluated_jobs"))
+        queue_conn.execute(text(SEED_TASKS), seed)
+        queue_conn.execute(text("ANALYZE llm_queue.tasks"))
+
+        conns = {"db": db_conn, "queue": queue_conn}
+        for name, target, sql, params in CHECKS:
+            plan = _explain(conns[target], sql, params)
+            scans = _seq_scans(plan)
+            status = "FAIL" if scans else "ok"
+            failed |= bool(scans)
+            detail = f" — seq scan on {', '.join(scans)}" if scans else ""
+            print(f"  {status:<4} {name} (cost {plan['Total Cost']:.0f}){detail}")
+    finally:
+        db_conn.rollback()
+        queue_conn.rollback()
+        db_conn.close()
+        queue_conn.close()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Apply SQL migrations in order and record them in public.schema_migrations.
+
+    python scripts/migrate.py                  # migrations/*.sql against DB_* env
+    python scripts/migrate.py --queue          # migrations/queue/*.sql against LLM_QUEUE_DSN
+    python scripts/migrate.py --dry-run        # list pending migrations only
+    python scripts/migrate.py --baseline 004   # mark everything up to 004 as applied
+                                               # (databases migrated by hand with psql)
+
+Each file runs in its own transaction together with its schema_migrations row,
+so a failing migration leaves nothing half-applied.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+def _dsn(queue: bool) -> str:
+    if queue:
+        return os.environ["LLM_QUEUE_DSN"]
+    return (
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+
+
+def _migration_files(queue: bool) -> list[Path]:
+    directory = MIGRATIONS_DIR / "queue" if queue else MIGRATIONS_DIR
+    return sorted(directory.glob("[0-9][0-9][0-9]_*.sql"))
+
+
+def _version(path: Path) -> str:
+    return path.relative_to(MIGRATIONS_DIR).as_posix()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue", action="store_true", help="migrate the llm_queue database")
+    parser.add_argument("--dry-run", action="store_true", help="list pending migrations without applying")
+    parser.add_argument("--baseline", metavar="NNN", help="record migrations up to NNN as applied without running them")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(_dsn(args.queue))
+    with conn, conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS public.schema_migrations (
+                version    text PRIMARY KEY,
+                applied_at timestamptz NOT NULL DEFAULT NOW()
+            )
+        """)
+        cur.execute("SELECT version FROM public.schema_migrations")
+        applied = {row[0] for row in cur.fetchall()}
+
+    pending = [p for p in _migration_files(args.queue) if _version(p) not in applied]
+    if not pending:
+        print("Up to date")
+        return
+
+    for path in pending:
+        version = _version(path)
+        if args.baseline is not None:
+            if path.name[:3] > args.baseline:
+                continue
+            with conn, conn.cursor() as cur:
+                cur.execute("INSERT INTO public.schema_migrations (version) VALUES (%s)", (version,))
+            print(f"  baselined {version}")
+            continue
+        if args.dry_run:
+            print(f"  pending {version}")
+            continue
+        print(f"  applying {version} ...", flush=True)
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute(path.read_text())
+                cur.execute("INSERT INTO public.schema_migrations (version) VALUES (%s)", (version,))
+        except psycopg2.Error as e:
+            print(f"FAILED {version}: {e}")
+            sys.exit(1)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()